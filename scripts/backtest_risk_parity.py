@@ -6,8 +6,11 @@ Compares two position sizing methods:
 2. Risk Parity: Inverse volatility weighting
 """
 
+import os
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Headless: skip GUI backend init
 import matplotlib.pyplot as plt
 from pathlib import Path
 import sys
@@ -18,6 +21,9 @@ sys.path.insert(0, str(project_root))
 from src.signals.trend_filter import generate_signals
 from src.portfolio.risk_parity import apply_risk_parity_to_signals
 
+# Figure resolution; set PLOT_DPI=300 for publication-quality output
+PLOT_DPI = int(os.environ.get('PLOT_DPI', 150))
+
 print('=' * 80)
 print('RISK PARITY vs EQUAL WEIGHT BACKTEST')
 print('=' * 80)
@@ -33,64 +39,74 @@ signals = generate_signals(prices, method='sma', window=252)
 # Calculate returns
 returns = prices.pct_change()
 
+# Weights are kept as ndarrays (rows = dates, columns = prices.columns);
+# labels are only reattached for reporting
+signals_arr = signals.to_numpy()
+
 # Method 1: Equal Weight
 print('\n[1/2] Equal Weight Portfolio...')
-ew_weights = signals.div(signals.sum(axis=1), axis=0).fillna(0)
+with np.errstate(invalid='ignore', divide='ignore'):
+    ew_weights = signals_arr / np.nansum(signals_arr, axis=1, keepdims=True)
+np.nan_to_num(ew_weights, copy=False)
 
 # Method 2: Risk Parity (Inverse Volatility)
 print('[2/2] Risk Parity Portfolio...')
-rp_weights = apply_risk_parity_to_signals(prices, signals, method='inverse_vol', lookback=60)
+rp_weights = apply_risk_parity_to_signals(prices, signals, method='inverse_vol', lookback=60).to_numpy()
 
 # Manual backtest function with custom weights
 def backtest_with_weights(prices, weights, transaction_cost=0.0005, rebalance_freq='M'):
-    """Simple backtest with custom weights."""
+    """Simple backtest with custom weights (ndarray aligned to prices)."""
     returns = prices.pct_change()
 
     # Shift weights to avoid lookahead
-    weights_shifted = weights.shift(1).fillna(0)
+    weights_shifted = np.zeros_like(weights)
+    weights_shifted[1:] = weights[:-1]
 
-    # Rebalance dates
+    # Rebalance dates, resolved once to a positional mask
     if rebalance_freq == 'M':
         rebalance_dates = pd.date_range(prices.index[0], prices.index[-1], freq='MS')
     else:
         rebalance_dates = prices.index
+    is_rebalance_day = prices.index.isin(rebalance_dates)
+
+    # Positional returns: no per-day label lookups inside the loop
+    ret_values = returns.values
 
     # Initialize
-    portfolio_value = pd.Series(100.0, index=prices.index)
-    turnover = pd.Series(0.0, index=prices.index)
-    prev_weights = pd.Series(0.0, index=prices.columns)
+    values = np.full(len(prices), 100.0)
+    turnover_values = np.zeros(len(prices))
+    prev_weights = np.zeros(prices.shape[1])
 
     for i in range(1, len(prices)):
-        date = prices.index[i]
-        prev_date = prices.index[i-1]
-
         # Check rebalance
-        is_rebalance = date in rebalance_dates
+        is_rebalance = is_rebalance_day[i]
 
         if is_rebalance or i == 1:
-            target_weights = weights_shifted.loc[date]
+            target_weights = weights_shifted[i]
 
             # Calculate turnover
-            turnover.iloc[i] = (target_weights - prev_weights).abs().sum()
+            turnover_values[i] = np.abs(target_weights - prev_weights).sum()
 
             # Transaction costs
-            tc_cost = turnover.iloc[i] * transaction_cost
-            portfolio_value.iloc[i] = portfolio_value.iloc[i-1] * (1 - tc_cost)
+            tc_cost = turnover_values[i] * transaction_cost
+            values[i] = values[i-1] * (1 - tc_cost)
 
             # Update weights
             prev_weights = target_weights
         else:
-            portfolio_value.iloc[i] = portfolio_value.iloc[i-1]
+            values[i] = values[i-1]
 
         # Apply returns
-        period_return = (prev_weights * returns.loc[date]).sum()
-        portfolio_value.iloc[i] = portfolio_value.iloc[i] * (1 + period_return)
+        period_return = np.nansum(prev_weights * ret_values[i])
+        values[i] = values[i] * (1 + period_return)
 
         # Drift weights
         if not is_rebalance:
-            individual_returns = returns.loc[date]
-            prev_weights = prev_weights * (1 + individual_returns) / (1 + period_return)
-            prev_weights = prev_weights.fillna(0)
+            prev_weights = prev_weights * (1 + ret_values[i]) / (1 + period_return)
+            prev_weights = np.where(np.isnan(prev_weights), 0.0, prev_weights)
+
+    portfolio_value = pd.Series(values, index=prices.index)
+    turnover = pd.Series(turnover_values, index=prices.index)
 
     # Calculate portfolio returns
     portfolio_returns = portfolio_value.pct_change().fillna(0)
@@ -191,9 +207,16 @@ print('\n' + '=' * 80)
 print('WEIGHT ALLOCATION ANALYSIS')
 print('=' * 80)
 
+def active_mean_weights(weights):
+    """Column-wise mean weight over the days each asset is held."""
+    active = weights > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(active, weights, 0.0).sum(axis=0) / active.sum(axis=0)
+    return pd.Series(means, index=prices.columns)
+
 print('\n=== Average Weights (when position active) ===')
-ew_avg_weights = ew_weights[ew_weights > 0].mean()
-rp_avg_weights = rp_weights[rp_weights > 0].mean()
+ew_avg_weights = active_mean_weights(ew_weights)
+rp_avg_weights = active_mean_weights(rp_weights)
 
 weight_comp = pd.DataFrame({
     'Equal Weight': ew_avg_weights,
@@ -270,8 +293,10 @@ rp_cum_val = (1 + rp_results['returns']).cumprod()
 ew_dd = (ew_cum_val - ew_cum_val.expanding().max()) / ew_cum_val.expanding().max()
 rp_dd = (rp_cum_val - rp_cum_val.expanding().max()) / rp_cum_val.expanding().max()
 
-ax3.fill_between(ew_dd.index, 0, ew_dd * 100, alpha=0.5, color='blue', label='Equal Weight')
-ax3.fill_between(rp_dd.index, 0, rp_dd * 100, alpha=0.5, color='green', label='Risk Parity')
+ax3.fill_between(ew_dd.index, 0, ew_dd * 100, alpha=0.5, color='blue', label='Equal Weight',
+                 rasterized=True)
+ax3.fill_between(rp_dd.index, 0, rp_dd * 100, alpha=0.5, color='green', label='Risk Parity',
+                 rasterized=True)
 ax3.set_title('Drawdown Comparison', fontsize=13, fontweight='bold')
 ax3.set_ylabel('Drawdown (%)', fontsize=11)
 ax3.legend(loc='lower left', fontsize=10)
@@ -301,8 +326,8 @@ ax4.grid(True, alpha=0.3)
 
 # 5. Weight distribution over time
 ax5 = fig.add_subplot(gs[2, 1])
-rp_avg = rp_weights[rp_weights > 0].mean().sort_values(ascending=False)
-ew_avg = ew_weights[ew_weights > 0].mean()[rp_avg.index]
+rp_avg = rp_avg_weights.sort_values(ascending=False)
+ew_avg = ew_avg_weights[rp_avg.index]
 
 x = np.arange(len(rp_avg))
 width = 0.35
@@ -321,7 +346,7 @@ ax6 = fig.add_subplot(gs[2, 2])
 ew_monthly = ew_results['returns'].resample('ME').sum()
 rp_monthly = rp_results['returns'].resample('ME').sum()
 
-ax6.scatter(ew_monthly * 100, rp_monthly * 100, alpha=0.5, s=20)
+ax6.scatter(ew_monthly * 100, rp_monthly * 100, alpha=0.5, s=20, rasterized=True)
 ax6.plot([-10, 15], [-10, 15], 'r--', linewidth=1)
 ax6.set_xlabel('EW Monthly Return (%)', fontsize=10)
 ax6.set_ylabel('RP Monthly Return (%)', fontsize=10)
@@ -338,7 +363,8 @@ ax6.text(0.05, 0.95, f'Correlation: {corr:.3f}', transform=ax6.transAxes,
 fig.suptitle('SMA Trend Strategy: Risk Parity vs Equal Weight Comparison',
              fontsize=16, fontweight='bold', y=0.998)
 
-plt.savefig(output_dir / 'risk_parity_vs_equal_weight.png', dpi=300, bbox_inches='tight')
+plt.savefig(output_dir / 'risk_parity_vs_equal_weight.png', dpi=PLOT_DPI, bbox_inches='tight',
+            metadata={'Software': None})
 print(f'Saved visualization to {output_dir / "risk_parity_vs_equal_weight.png"}')
 
 # Winner determination
@@ -13,15 +13,21 @@ Compares performance metrics and visualizes results.
 """
 
 from pathlib import Path
+import os
 import sys
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Headless: skip GUI backend init
 import matplotlib.pyplot as plt
 
 # Add project root to path
 project_root = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(project_root))
 
+# Figure resolution; set PLOT_DPI=300 for publication-quality output
+PLOT_DPI = int(os.environ.get('PLOT_DPI', 150))
+
 from src.signals.trend_filter import generate_signals
 from src.backtest.engine import calculate_strategy_returns, calculate_performance_metrics, calculate_drawdown_series
 
@@ -280,7 +286,7 @@ def plot_comprehensive_comparison(results: dict, comparison_df: pd.DataFrame, ou
     ax9.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.savefig(output_path, dpi=PLOT_DPI, bbox_inches='tight', metadata={'Software': None})
     print(f"\nVisualization saved to: {output_path}")
     plt.close()
 
@@ -1,5 +1,9 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Headless: only saves PNG, never shows a window
 import matplotlib.pyplot as plt
 from pathlib import Path
 import sys
@@ -7,251 +11,346 @@ import sys
 project_root = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(project_root))
 
+from src.data.cache import cached, file_key, load_prices
 from src.signals.trend_filter import generate_signals
-from src.backtest.engine import backtest_strategy, calculate_drawdown_series
-
-# Load data
-prices = pd.read_csv(project_root / 'data' / 'processed' / 'prices_clean.csv',
-                     index_col=0, parse_dates=True)
-
-# Generate signals for both strategies
-print('Generating signals...')
-sma_signals = generate_signals(prices, method='sma', window=252)
-dual_signals = generate_signals(prices, method='dual', lookback=252, top_n=2)
-
-# Calculate benchmark
-bh_equal = prices.pct_change().mean(axis=1)
-
-# Run backtests
-print('Running SMA backtest...')
-sma_results = backtest_strategy(
-    prices=prices,
-    signals=sma_signals,
-    transaction_cost=0.0005,
-    rebalance_frequency='M'
+from src.backtest.engine import (
+    backtest_strategy, calculate_drawdown_series, calculate_rolling_sharpe
 )
 
-print('Running Dual Momentum backtest...')
-dual_results = backtest_strategy(
-    prices=prices,
-    signals=dual_signals,
-    transaction_cost=0.0005,
-    rebalance_frequency='M'
-)
-
-# Create comparison table
-comparison_df = pd.DataFrame({
-    'SMA Trend': sma_results['performance_metrics'],
-    'Dual Momentum': dual_results['performance_metrics'],
-    'Buy & Hold': {
-        'total_return': 3.0511,
-        'annualized_return': 0.0696,
-        'annualized_volatility': 0.1181,
-        'sharpe_ratio': 0.59,
-        'sortino_ratio': 0.75,
-        'max_drawdown': -0.3561,
-        'calmar_ratio': 0.20,
-        'win_rate': 0.5460,
-        'avg_win': 0.0048,
-        'avg_loss': -0.0052
-    }
-}).T
-
-print('\n' + '=' * 80)
-print('STRATEGY COMPARISON TABLE')
-print('=' * 80)
-print(comparison_df.to_string())
-
-# Save comparison
-output_dir = project_root / 'outputs'
-comparison_df.to_csv(output_dir / 'strategy_comparison.csv')
-print(f'\nSaved comparison to {output_dir / "strategy_comparison.csv"}')
-
-# Create comprehensive visualization
-fig = plt.figure(figsize=(18, 12))
-gs = fig.add_gridspec(3, 3, hspace=0.35, wspace=0.3)
-
-# 1. Cumulative returns
-ax1 = fig.add_subplot(gs[0, :2])
-sma_cum = (1 + sma_results['portfolio_stats']['returns']).cumprod()
-dual_cum = (1 + dual_results['portfolio_stats']['returns']).cumprod()
-bh_cum = (1 + bh_equal).cumprod()
-
-ax1.plot(sma_cum.index, sma_cum, label='SMA Trend', linewidth=2.5, color='blue', alpha=0.9)
-ax1.plot(dual_cum.index, dual_cum, label='Dual Momentum', linewidth=2.5, color='green', alpha=0.9)
-ax1.plot(bh_cum.index, bh_cum, label='Buy & Hold', linewidth=2, color='gray', linestyle='--', alpha=0.7)
-
-ax1.set_title('Cumulative Returns Comparison', fontsize=14, fontweight='bold')
-ax1.set_ylabel('Cumulative Return (Initial = 1.0)', fontsize=11)
-ax1.legend(loc='upper left', fontsize=11)
-ax1.grid(True, alpha=0.3)
-ax1.axhline(y=1.0, color='black', linestyle='-', linewidth=0.5)
-
-# Add final values
-sma_pct = sma_results['performance_metrics']['total_return'] * 100
-dual_pct = dual_results['performance_metrics']['total_return'] * 100
-textstr = f"Final Values:\nSMA: {sma_cum.iloc[-1]:.2f} ({sma_pct:.1f}%)\nDual: {dual_cum.iloc[-1]:.2f} ({dual_pct:.1f}%)\nB&H: {bh_cum.iloc[-1]:.2f} (305.1%)"
-ax1.text(0.02, 0.98, textstr, transform=ax1.transAxes, fontsize=9,
-        verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
-
-# 2. Performance metrics bar chart
-ax2 = fig.add_subplot(gs[0, 2])
-metrics = ['Ann. Return\n(%)', 'Sharpe\n(x10)', 'Sortino\n(x10)', 'Calmar\n(x10)']
-sma_vals = [
-    sma_results['performance_metrics']['annualized_return'] * 100,
-    sma_results['performance_metrics']['sharpe_ratio'] * 10,
-    sma_results['performance_metrics']['sortino_ratio'] * 10,
-    sma_results['performance_metrics']['calmar_ratio'] * 10
-]
-dual_vals = [
-    dual_results['performance_metrics']['annualized_return'] * 100,
-    dual_results['performance_metrics']['sharpe_ratio'] * 10,
-    dual_results['performance_metrics']['sortino_ratio'] * 10,
-    dual_results['performance_metrics']['calmar_ratio'] * 10
-]
-bh_vals = [6.96, 5.9, 7.5, 2.0]
-
-x = np.arange(len(metrics))
-width = 0.25
-
-ax2.bar(x - width, sma_vals, width, label='SMA', color='blue', alpha=0.8)
-ax2.bar(x, dual_vals, width, label='Dual', color='green', alpha=0.8)
-ax2.bar(x + width, bh_vals, width, label='B&H', color='gray', alpha=0.6)
-
-ax2.set_title('Key Metrics', fontsize=12, fontweight='bold')
-ax2.set_xticks(x)
-ax2.set_xticklabels(metrics, fontsize=8)
-ax2.legend(fontsize=9)
-ax2.grid(True, alpha=0.3, axis='y')
-
-# 3. Drawdown comparison
-ax3 = fig.add_subplot(gs[1, :])
-sma_dd = sma_results['drawdown_series']
-dual_dd = dual_results['drawdown_series']
-bh_dd = calculate_drawdown_series(bh_equal)
-
-ax3.fill_between(sma_dd.index, 0, sma_dd * 100, alpha=0.5, color='blue', label='SMA')
-ax3.fill_between(dual_dd.index, 0, dual_dd * 100, alpha=0.4, color='green', label='Dual')
-ax3.fill_between(bh_dd.index, 0, bh_dd * 100, alpha=0.3, color='gray', label='B&H')
-
-ax3.set_title('Drawdown Comparison', fontsize=13, fontweight='bold')
-ax3.set_ylabel('Drawdown (%)', fontsize=11)
-ax3.legend(loc='lower left', fontsize=10)
-ax3.grid(True, alpha=0.3)
-
-sma_dd_pct = sma_results['performance_metrics']['max_drawdown'] * 100
-dual_dd_pct = dual_results['performance_metrics']['max_drawdown'] * 100
-textstr = f"Max Drawdowns:\nSMA: {sma_dd_pct:.1f}%\nDual: {dual_dd_pct:.1f}%\nB&H: -35.6%"
-ax3.text(0.98, 0.95, textstr, transform=ax3.transAxes, fontsize=9,
-        verticalalignment='top', horizontalalignment='right',
-        bbox=dict(boxstyle='round', facecolor='lightcoral', alpha=0.7))
-
-# 4. Rolling Sharpe
-ax4 = fig.add_subplot(gs[2, 0])
-window = 252
-sma_sharpe = (sma_results['portfolio_stats']['returns'].rolling(window).mean() /
-              sma_results['portfolio_stats']['returns'].rolling(window).std()) * np.sqrt(252)
-dual_sharpe = (dual_results['portfolio_stats']['returns'].rolling(window).mean() /
-               dual_results['portfolio_stats']['returns'].rolling(window).std()) * np.sqrt(252)
-
-ax4.plot(sma_sharpe.index, sma_sharpe, label='SMA', linewidth=1.5, color='blue', alpha=0.8)
-ax4.plot(dual_sharpe.index, dual_sharpe, label='Dual', linewidth=1.5, color='green', alpha=0.8)
-ax4.axhline(y=0, color='red', linestyle='-', linewidth=0.5)
-ax4.axhline(y=1.0, color='black', linestyle='--', linewidth=0.5, alpha=0.3)
-ax4.set_title('Rolling 12M Sharpe', fontsize=11, fontweight='bold')
-ax4.set_ylabel('Sharpe Ratio', fontsize=10)
-ax4.legend(fontsize=9)
-ax4.grid(True, alpha=0.3)
-
-# 5. Positions held over time
-ax5 = fig.add_subplot(gs[2, 1])
-sma_positions = sma_results['portfolio_stats']['positions'].resample('ME').mean()
-dual_positions = dual_results['portfolio_stats']['positions'].resample('ME').mean()
-
-ax5.plot(sma_positions.index, sma_positions, label='SMA', linewidth=2, color='blue', alpha=0.7)
-ax5.plot(dual_positions.index, dual_positions, label='Dual', linewidth=2, color='green', alpha=0.7)
-ax5.set_title('Average Positions Held', fontsize=11, fontweight='bold')
-ax5.set_ylabel('Number of Positions', fontsize=10)
-ax5.legend(fontsize=9)
-ax5.grid(True, alpha=0.3)
-ax5.set_ylim([0, 5.5])
-
-sma_avg_pos = sma_results['portfolio_stats']['positions'].mean()
-dual_avg_pos = dual_results['portfolio_stats']['positions'].mean()
-textstr = f"Avg Positions:\nSMA: {sma_avg_pos:.2f}\nDual: {dual_avg_pos:.2f}"
-ax5.text(0.98, 0.95, textstr, transform=ax5.transAxes, fontsize=9,
-        verticalalignment='top', horizontalalignment='right',
-        bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.8))
-
-# 6. Monthly returns scatter
-ax6 = fig.add_subplot(gs[2, 2])
-sma_monthly = sma_results['portfolio_stats']['returns'].resample('ME').sum()
-dual_monthly = dual_results['portfolio_stats']['returns'].resample('ME').sum()
-
-ax6.scatter(sma_monthly * 100, dual_monthly * 100, alpha=0.5, s=20)
-ax6.plot([-15, 20], [-15, 20], 'r--', linewidth=1, label='45 line')
-ax6.set_xlabel('SMA Monthly Return (%)', fontsize=10)
-ax6.set_ylabel('Dual Monthly Return (%)', fontsize=10)
-ax6.set_title('Monthly Return Scatter', fontsize=11, fontweight='bold')
-ax6.grid(True, alpha=0.3)
-ax6.axhline(y=0, color='black', linewidth=0.5)
-ax6.axvline(x=0, color='black', linewidth=0.5)
-
-corr = sma_monthly.corr(dual_monthly)
-ax6.text(0.05, 0.95, f'Correlation: {corr:.3f}', transform=ax6.transAxes,
-        fontsize=9, verticalalignment='top',
-        bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.7))
-
-fig.suptitle('Strategy Comparison: SMA Trend vs Dual Momentum vs Buy-and-Hold',
-             fontsize=16, fontweight='bold', y=0.998)
-
-plt.savefig(output_dir / 'strategy_comparison.png', dpi=300, bbox_inches='tight')
-print(f'Saved comparison visualization to {output_dir / "strategy_comparison.png"}')
-
-# Print summary insights
-print('\n' + '=' * 80)
-print('KEY INSIGHTS')
-print('=' * 80)
-
-sma_ret = sma_results['performance_metrics']['total_return']
-dual_ret = dual_results['performance_metrics']['total_return']
-sma_ann = sma_results['performance_metrics']['annualized_return']
-dual_ann = dual_results['performance_metrics']['annualized_return']
-
-print('\n1. RETURNS:')
-print(f'   SMA Trend: {sma_ret:.1%} ({sma_ann:.2%}/year)')
-print(f'   Dual Momentum: {dual_ret:.1%} ({dual_ann:.2%}/year)')
-print(f'   Winner: SMA (+{(sma_ret - dual_ret):.1%})')
-
-sma_sharpe = sma_results['performance_metrics']['sharpe_ratio']
-dual_sharpe = dual_results['performance_metrics']['sharpe_ratio']
-
-print('\n2. RISK-ADJUSTED RETURNS (Sharpe):')
-print(f'   SMA Trend: {sma_sharpe:.2f}')
-print(f'   Dual Momentum: {dual_sharpe:.2f}')
-print(f'   Winner: SMA (+{(sma_sharpe - dual_sharpe):.2f})')
-
-sma_dd = sma_results['performance_metrics']['max_drawdown']
-dual_dd = dual_results['performance_metrics']['max_drawdown']
-
-print('\n3. DOWNSIDE RISK (Max Drawdown):')
-print(f'   SMA Trend: {sma_dd:.1%}')
-print(f'   Dual Momentum: {dual_dd:.1%}')
-print(f'   Winner: SMA ({abs(dual_dd - sma_dd):.1%} lower)')
-
-print('\n4. PORTFOLIO CONCENTRATION:')
-print(f'   SMA Trend: {sma_avg_pos:.2f} avg positions')
-print(f'   Dual Momentum: {dual_avg_pos:.2f} avg positions')
-print('   Dual is more concentrated (holds top 2 only)')
-
-sma_turn = sma_results['portfolio_stats']['turnover'].resample('ME').sum().mean()
-dual_turn = dual_results['portfolio_stats']['turnover'].resample('ME').sum().mean()
-
-print('\n5. TURNOVER:')
-print(f'   SMA Trend: {sma_turn:.1%} monthly')
-print(f'   Dual Momentum: {dual_turn:.1%} monthly')
-print(f'   Winner: Dual (lower turnover)')
-
-print('\n' + '=' * 80)
-print('CONCLUSION: SMA Trend strategy superior on risk-adjusted basis')
-print('=' * 80)
+# Figure resolution; set PLOT_DPI=300 for publication-quality output
+PLOT_DPI = int(os.environ.get('PLOT_DPI', 150))
+
+# Simplify the long daily lines aggressively before rasterization
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
+
+
+def run_signal_backtest(prices, signal_params, backtest_params):
+    """Generate signals and backtest them; top-level so worker processes can pickle it."""
+    signals = generate_signals(prices, **signal_params)
+    results = backtest_strategy(prices=prices, signals=signals, **backtest_params)
+    return signals, results
+
+
+def equal_weight_returns(prices):
+    """
+    Daily equal-weight benchmark return: cross-asset mean of pct_change.
+
+    One divide into a preallocated buffer and one row reduction on the
+    raw array; NaN returns are skipped as in DataFrame.mean(axis=1).
+    """
+    a = prices.to_numpy(dtype=np.float64)
+    r = np.empty_like(a)
+    r[0] = np.nan
+    np.divide(a[1:], a[:-1], out=r[1:])
+    r[1:] -= 1.0
+
+    valid = ~np.isnan(r)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(valid, r, 0.0).sum(axis=1) / valid.sum(axis=1)
+    return pd.Series(mean, index=prices.index)
+
+
+def benchmark_series(prices):
+    """Equal-weight buy-and-hold daily returns and their drawdown series."""
+    bh_returns = equal_weight_returns(prices)
+    return bh_returns, calculate_drawdown_series(bh_returns)
+
+
+def cumret_matrix(returns_list):
+    """
+    Growth of 1.0 for several aligned daily return series at once.
+
+    Fills one preallocated column-major (n, k) buffer in place and runs a
+    single np.cumprod down the columns. NaN days (e.g. the first
+    pct_change row) are skipped and left NaN, as in pandas cumprod.
+    """
+    cum = np.empty((len(returns_list[0]), len(returns_list)), order='F')
+    for i, returns in enumerate(returns_list):
+        np.add(returns.to_numpy(), 1.0, out=cum[:, i])
+
+    missing = np.isnan(cum)
+    cum[missing] = 1.0
+    np.cumprod(cum, axis=0, out=cum)
+    cum[missing] = np.nan
+    return cum
+
+
+def main():
+    """Compare SMA trend, dual momentum and buy-and-hold."""
+    # Load data; the parsed frame is cached in binary form so the CSV
+    # (and its date parsing) is only read again when the file changes
+    data_path = project_root / 'data' / 'processed' / 'prices_clean.csv'
+    prices = load_prices(data_path)
+    data_key = file_key(data_path)
+
+    # Generate signals and run both backtests concurrently
+    sma_params = {'method': 'sma', 'window': 252}
+    dual_params = {'method': 'dual', 'lookback': 252, 'top_n': 2}
+    backtest_params = {'transaction_cost': 0.0005, 'rebalance_frequency': 'M'}
+
+    print('Running SMA and Dual Momentum backtests...')
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        sma_future = pool.submit(
+            cached, ('signals_and_backtest', data_key, sma_params, backtest_params),
+            run_signal_backtest, prices, sma_params, backtest_params
+        )
+        dual_future = pool.submit(
+            cached, ('signals_and_backtest', data_key, dual_params, backtest_params),
+            run_signal_backtest, prices, dual_params, backtest_params
+        )
+        sma_signals, sma_results = sma_future.result()
+        dual_signals, dual_results = dual_future.result()
+
+    # Bind the pieces used throughout the report once
+    sma_metrics = sma_results['performance_metrics']
+    dual_metrics = dual_results['performance_metrics']
+    sma_stats = sma_results['portfolio_stats']
+    dual_stats = dual_results['portfolio_stats']
+    sma_returns = sma_stats['returns']
+    dual_returns = dual_stats['returns']
+
+    # Calculate benchmark
+    bh_equal, bh_dd = cached(('benchmark_and_drawdown', data_key), benchmark_series, prices)
+
+    # Month-end label for every trading day; shared by all monthly
+    # aggregations below (same buckets and labels as resample('ME'))
+    month_key = prices.index + pd.offsets.MonthEnd(0)
+
+    # Create comparison table
+    comparison_df = pd.DataFrame({
+        'SMA Trend': sma_metrics,
+        'Dual Momentum': dual_metrics,
+        'Buy & Hold': {
+            'total_return': 3.0511,
+            'annualized_return': 0.0696,
+            'annualized_volatility': 0.1181,
+            'sharpe_ratio': 0.59,
+            'sortino_ratio': 0.75,
+            'max_drawdown': -0.3561,
+            'calmar_ratio': 0.20,
+            'win_rate': 0.5460,
+            'avg_win': 0.0048,
+            'avg_loss': -0.0052
+        }
+    }).T
+
+    print('\n' + '=' * 80)
+    print('STRATEGY COMPARISON TABLE')
+    print('=' * 80)
+    print(comparison_df.to_string(float_format='%.6g'))
+
+    # Save comparison
+    output_dir = project_root / 'outputs'
+    comparison_df.to_csv(output_dir / 'strategy_comparison.csv', float_format='%.6g')
+    print(f'\nSaved comparison to {output_dir / "strategy_comparison.csv"}')
+
+    # Create comprehensive visualization
+    fig = plt.figure(figsize=(18, 12))
+    axd = fig.subplot_mosaic(
+        [['equity', 'equity', 'metrics'],
+         ['drawdown', 'drawdown', 'drawdown'],
+         ['sharpe', 'positions', 'monthly']],
+        gridspec_kw=dict(hspace=0.35, wspace=0.3)
+    )
+
+    # 1. Cumulative returns
+    ax1 = axd['equity']
+    # All three curves share one date axis and live in one (n, 3) buffer;
+    # plot raw arrays so matplotlib skips the pandas unit conversion
+    dates = sma_returns.index.to_numpy()
+    cum = cumret_matrix([
+        sma_returns,
+        dual_returns.reindex(sma_returns.index),
+        bh_equal.reindex(sma_returns.index)
+    ])
+    sma_cum, dual_cum, bh_cum = cum[:, 0], cum[:, 1], cum[:, 2]
+
+    ax1.plot(dates, sma_cum, label='SMA Trend', linewidth=2.5, color='blue', alpha=0.9)
+    ax1.plot(dates, dual_cum, label='Dual Momentum', linewidth=2.5, color='green', alpha=0.9)
+    ax1.plot(dates, bh_cum, label='Buy & Hold', linewidth=2, color='gray', linestyle='--', alpha=0.7)
+
+    ax1.set_title('Cumulative Returns Comparison', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Cumulative Return (Initial = 1.0)', fontsize=11)
+    ax1.legend(loc='upper left', fontsize=11)
+    ax1.grid(True, alpha=0.3)
+    ax1.axhline(y=1.0, color='black', linestyle='-', linewidth=0.5)
+
+    # Add final values
+    sma_pct = sma_metrics['total_return'] * 100
+    dual_pct = dual_metrics['total_return'] * 100
+    textstr = f"Final Values:\nSMA: {sma_cum[-1]:.2f} ({sma_pct:.1f}%)\nDual: {dual_cum[-1]:.2f} ({dual_pct:.1f}%)\nB&H: {bh_cum[-1]:.2f} (305.1%)"
+    ax1.text(0.02, 0.98, textstr, transform=ax1.transAxes, fontsize=9,
+            verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+
+    # 2. Performance metrics bar chart
+    ax2 = axd['metrics']
+    metrics = ['Ann. Return\n(%)', 'Sharpe\n(x10)', 'Sortino\n(x10)', 'Calmar\n(x10)']
+    bar_keys = ['annualized_return', 'sharpe_ratio', 'sortino_ratio', 'calmar_ratio']
+    bar_scale = np.array([100, 10, 10, 10])
+    sma_vals = np.array([sma_metrics[k] for k in bar_keys]) * bar_scale
+    dual_vals = np.array([dual_metrics[k] for k in bar_keys]) * bar_scale
+    bh_vals = [6.96, 5.9, 7.5, 2.0]
+
+    x = np.arange(len(metrics))
+    width = 0.25
+
+    ax2.bar(x - width, sma_vals, width, label='SMA', color='blue', alpha=0.8)
+    ax2.bar(x, dual_vals, width, label='Dual', color='green', alpha=0.8)
+    ax2.bar(x + width, bh_vals, width, label='B&H', color='gray', alpha=0.6)
+
+    ax2.set_title('Key Metrics', fontsize=12, fontweight='bold')
+    ax2.set_xticks(x)
+    ax2.set_xticklabels(metrics, fontsize=8)
+    ax2.legend(fontsize=9)
+    ax2.grid(True, alpha=0.3, axis='y')
+
+    # 3. Drawdown comparison
+    ax3 = axd['drawdown']
+    # Scale all three drawdown series to percent in one multiply on the
+    # shared date axis, so matplotlib receives ready-made arrays
+    sma_dd_arr, dual_dd_arr, bh_dd_arr = np.vstack([
+        sma_results['drawdown_series'].to_numpy(),
+        dual_results['drawdown_series'].reindex(sma_returns.index).to_numpy(),
+        bh_dd.reindex(sma_returns.index).to_numpy()
+    ]) * 100.0
+
+    ax3.fill_between(dates, 0, sma_dd_arr, alpha=0.5, color='blue', label='SMA',
+                     rasterized=True)
+    ax3.fill_between(dates, 0, dual_dd_arr, alpha=0.4, color='green', label='Dual',
+                     rasterized=True)
+    ax3.fill_between(dates, 0, bh_dd_arr, alpha=0.3, color='gray', label='B&H',
+                     rasterized=True)
+
+    ax3.set_title('Drawdown Comparison', fontsize=13, fontweight='bold')
+    ax3.set_ylabel('Drawdown (%)', fontsize=11)
+    ax3.legend(loc='lower left', fontsize=10)
+    ax3.grid(True, alpha=0.3)
+
+    sma_dd_pct = sma_metrics['max_drawdown'] * 100
+    dual_dd_pct = dual_metrics['max_drawdown'] * 100
+    textstr = f"Max Drawdowns:\nSMA: {sma_dd_pct:.1f}%\nDual: {dual_dd_pct:.1f}%\nB&H: -35.6%"
+    ax3.text(0.98, 0.95, textstr, transform=ax3.transAxes, fontsize=9,
+            verticalalignment='top', horizontalalignment='right',
+            bbox=dict(boxstyle='round', facecolor='lightcoral', alpha=0.7))
+
+    # 4. Rolling Sharpe
+    ax4 = axd['sharpe']
+    window = 252
+    # Both strategies in one rolling pass over a two-column frame
+    rolling = calculate_rolling_sharpe(
+        pd.DataFrame({'sma': sma_returns, 'dual': dual_returns.reindex(sma_returns.index)}),
+        window
+    )
+    sma_sharpe, dual_sharpe = rolling['sma'].to_numpy(), rolling['dual'].to_numpy()
+
+    ax4.plot(dates, sma_sharpe, label='SMA', linewidth=1.5, color='blue', alpha=0.8)
+    ax4.plot(dates, dual_sharpe, label='Dual', linewidth=1.5, color='green', alpha=0.8)
+    ax4.axhline(y=0, color='red', linestyle='-', linewidth=0.5)
+    ax4.axhline(y=1.0, color='black', linestyle='--', linewidth=0.5, alpha=0.3)
+    ax4.set_title('Rolling 12M Sharpe', fontsize=11, fontweight='bold')
+    ax4.set_ylabel('Sharpe Ratio', fontsize=10)
+    ax4.legend(fontsize=9)
+    ax4.grid(True, alpha=0.3)
+
+    # 5. Positions held over time
+    ax5 = axd['positions']
+    sma_positions = sma_stats['positions'].groupby(month_key).mean()
+    dual_positions = dual_stats['positions'].groupby(month_key).mean()
+
+    ax5.plot(sma_positions.index, sma_positions, label='SMA', linewidth=2, color='blue', alpha=0.7)
+    ax5.plot(dual_positions.index, dual_positions, label='Dual', linewidth=2, color='green', alpha=0.7)
+    ax5.set_title('Average Positions Held', fontsize=11, fontweight='bold')
+    ax5.set_ylabel('Number of Positions', fontsize=10)
+    ax5.legend(fontsize=9)
+    ax5.grid(True, alpha=0.3)
+    ax5.set_ylim([0, 5.5])
+
+    sma_avg_pos = sma_stats['positions'].mean()
+    dual_avg_pos = dual_stats['positions'].mean()
+    textstr = f"Avg Positions:\nSMA: {sma_avg_pos:.2f}\nDual: {dual_avg_pos:.2f}"
+    ax5.text(0.98, 0.95, textstr, transform=ax5.transAxes, fontsize=9,
+            verticalalignment='top', horizontalalignment='right',
+            bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.8))
+
+    # 6. Monthly returns density
+    ax6 = axd['monthly']
+    sma_monthly = sma_returns.groupby(month_key).sum()
+    dual_monthly = dual_returns.groupby(month_key).sum()
+
+    sma_monthly_pct = sma_monthly.to_numpy() * 100
+    dual_monthly_pct = dual_monthly.to_numpy() * 100
+
+    # Binned density: a fixed number of hexagons however long the history
+    ax6.hexbin(sma_monthly_pct, dual_monthly_pct, gridsize=30, cmap='Blues', mincnt=1)
+    ax6.plot([-15, 20], [-15, 20], 'r--', linewidth=1, label='45 line')
+    ax6.set_xlabel('SMA Monthly Return (%)', fontsize=10)
+    ax6.set_ylabel('Dual Monthly Return (%)', fontsize=10)
+    ax6.set_title('Monthly Return Scatter', fontsize=11, fontweight='bold')
+    ax6.grid(True, alpha=0.3)
+    ax6.axhline(y=0, color='black', linewidth=0.5)
+    ax6.axvline(x=0, color='black', linewidth=0.5)
+
+    corr = np.corrcoef(sma_monthly_pct, dual_monthly_pct)[0, 1]
+    ax6.text(0.05, 0.95, f'Correlation: {corr:.3f}', transform=ax6.transAxes,
+            fontsize=9, verticalalignment='top',
+            bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.7))
+
+    fig.suptitle('Strategy Comparison: SMA Trend vs Dual Momentum vs Buy-and-Hold',
+                 fontsize=16, fontweight='bold', y=0.998)
+
+    plt.savefig(output_dir / 'strategy_comparison.png', dpi=PLOT_DPI, bbox_inches='tight',
+                metadata={'Software': None})
+    print(f'Saved comparison visualization to {output_dir / "strategy_comparison.png"}')
+
+    # Print summary insights
+    print('\n' + '=' * 80)
+    print('KEY INSIGHTS')
+    print('=' * 80)
+
+    sma_ret = sma_metrics['total_return']
+    dual_ret = dual_metrics['total_return']
+    sma_ann = sma_metrics['annualized_return']
+    dual_ann = dual_metrics['annualized_return']
+
+    print('\n1. RETURNS:')
+    print(f'   SMA Trend: {sma_ret:.1%} ({sma_ann:.2%}/year)')
+    print(f'   Dual Momentum: {dual_ret:.1%} ({dual_ann:.2%}/year)')
+    print(f'   Winner: SMA (+{(sma_ret - dual_ret):.1%})')
+
+    sma_sharpe = sma_metrics['sharpe_ratio']
+    dual_sharpe = dual_metrics['sharpe_ratio']
+
+    print('\n2. RISK-ADJUSTED RETURNS (Sharpe):')
+    print(f'   SMA Trend: {sma_sharpe:.2f}')
+    print(f'   Dual Momentum: {dual_sharpe:.2f}')
+    print(f'   Winner: SMA (+{(sma_sharpe - dual_sharpe):.2f})')
+
+    sma_dd = sma_metrics['max_drawdown']
+    dual_dd = dual_metrics['max_drawdown']
+
+    print('\n3. DOWNSIDE RISK (Max Drawdown):')
+    print(f'   SMA Trend: {sma_dd:.1%}')
+    print(f'   Dual Momentum: {dual_dd:.1%}')
+    print(f'   Winner: SMA ({abs(dual_dd - sma_dd):.1%} lower)')
+
+    print('\n4. PORTFOLIO CONCENTRATION:')
+    print(f'   SMA Trend: {sma_avg_pos:.2f} avg positions')
+    print(f'   Dual Momentum: {dual_avg_pos:.2f} avg positions')
+    print('   Dual is more concentrated (holds top 2 only)')
+
+    sma_turn = sma_stats['turnover'].groupby(month_key).sum().mean()
+    dual_turn = dual_stats['turnover'].groupby(month_key).sum().mean()
+
+    print('\n5. TURNOVER:')
+    print(f'   SMA Trend: {sma_turn:.1%} monthly')
+    print(f'   Dual Momentum: {dual_turn:.1%} monthly')
+    print(f'   Winner: Dual (lower turnover)')
+
+    print('\n' + '=' * 80)
+    print('CONCLUSION: SMA Trend strategy superior on risk-adjusted basis')
+    print('=' * 80)
+
+
+if __name__ == "__main__":
+    main()
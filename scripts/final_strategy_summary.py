@@ -19,8 +19,12 @@ Compares to:
 
 from pathlib import Path
 import sys
+import os
+from collections import namedtuple
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Headless: only saves PNG, never shows a window
 import matplotlib.pyplot as plt
 from datetime import datetime
 
@@ -28,132 +32,123 @@ from datetime import datetime
 project_root = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(project_root))
 
+from src.data.cache import load_prices
 from src.signals.trend_filter import generate_signals
-from src.backtest.engine import calculate_strategy_returns, calculate_performance_metrics, calculate_drawdown_series
+from src.backtest.engine import (
+    calculate_strategy_returns_batch, calculate_performance_metrics, calculate_drawdown_series,
+    calculate_rolling_sharpe
+)
+
+# Figure resolution; set PLOT_DPI=300 for publication-quality output
+PLOT_DPI = int(os.environ.get('PLOT_DPI', 150))
+
+# Simplify the long daily lines aggressively and draw them in chunks
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
+plt.rcParams['agg.path.chunksize'] = 10000
+
+# One strategy in the summary; method None means buy & hold
+StratSpec = namedtuple('StratSpec', 'name label method params cost description')
+
+STRATEGIES = (
+    StratSpec('Final Strategy (EMA 126d)', 'FINAL STRATEGY: EMA 126-day',
+              'ema', {'span': 126}, 0.0005, 'Optimized EMA 6-month trend following'),
+    StratSpec('Initial Strategy (EMA 252d)', 'INITIAL STRATEGY: EMA 252-day',
+              'ema', {'span': 252}, 0.0005, 'Initial EMA 12-month baseline'),
+    StratSpec('SMA 252d', 'ALTERNATIVE 1: SMA 252-day',
+              'sma', {'window': 252}, 0.0005, 'Industry-standard SMA trend filter'),
+    StratSpec('Relative Momentum (top 3)', 'ALTERNATIVE 2: Relative Momentum',
+              'relative', {'lookback': 252, 'top_n': 3}, 0.0005, 'Cross-sectional momentum ranking'),
+    StratSpec('Buy & Hold (Benchmark)', 'BENCHMARK: Buy & Hold',
+              None, {}, 0.0, 'Passive equal-weight benchmark'),
+)
 
 
 def run_final_strategy(prices: pd.DataFrame) -> dict:
     """
     Run final optimized strategy and benchmarks.
 
+    The strategies in STRATEGIES are backtested together in one batched
+    pass over the prices.
+
     Returns
     -------
     dict
         Results for all strategies.
     """
-    results = {}
-
-    # 1. FINAL STRATEGY: EMA 126-day
-    print("Running FINAL STRATEGY: EMA 126-day...")
-    ema_126_signals = generate_signals(prices, method='ema', span=126)
-    ema_126_results = calculate_strategy_returns(
+    all_signals = []
+    for spec in STRATEGIES:
+        print(f"Running {spec.label}...")
+        if spec.method is None:
+            # Buy & hold: always long every asset
+            signals = pd.DataFrame(1.0, index=prices.index, columns=prices.columns)
+        else:
+            signals = generate_signals(prices, method=spec.method, **spec.params)
+        all_signals.append(signals)
+
+    all_results = calculate_strategy_returns_batch(
         prices,
-        ema_126_signals,
-        transaction_cost=0.0005,
+        all_signals,
+        transaction_cost=[spec.cost for spec in STRATEGIES],
         rebalance_frequency='M'
     )
-    ema_126_metrics = calculate_performance_metrics(ema_126_results['returns'])
-    results['Final Strategy (EMA 126d)'] = {
-        'signals': ema_126_signals,
-        'results': ema_126_results,
-        'metrics': ema_126_metrics,
-        'description': 'Optimized EMA 6-month trend following'
-    }
 
-    # 2. INITIAL STRATEGY: EMA 252-day (for comparison)
-    print("Running INITIAL STRATEGY: EMA 252-day...")
-    ema_252_signals = generate_signals(prices, method='ema', span=252)
-    ema_252_results = calculate_strategy_returns(
-        prices,
-        ema_252_signals,
-        transaction_cost=0.0005,
-        rebalance_frequency='M'
-    )
-    ema_252_metrics = calculate_performance_metrics(ema_252_results['returns'])
-    results['Initial Strategy (EMA 252d)'] = {
-        'signals': ema_252_signals,
-        'results': ema_252_results,
-        'metrics': ema_252_metrics,
-        'description': 'Initial EMA 12-month baseline'
-    }
+    results = {}
+    for spec, signals, backtest in zip(STRATEGIES, all_signals, all_results):
+        results[spec.name] = {
+            'signals': signals,
+            'results': backtest,
+            'metrics': calculate_performance_metrics(backtest['returns']),
+            'dd': calculate_drawdown_series(backtest['returns']),
+            'description': spec.description
+        }
 
-    # 3. ALTERNATIVE 1: SMA 252-day
-    print("Running ALTERNATIVE 1: SMA 252-day...")
-    sma_252_signals = generate_signals(prices, method='sma', window=252)
-    sma_252_results = calculate_strategy_returns(
-        prices,
-        sma_252_signals,
-        transaction_cost=0.0005,
-        rebalance_frequency='M'
-    )
-    sma_252_metrics = calculate_performance_metrics(sma_252_results['returns'])
-    results['SMA 252d'] = {
-        'signals': sma_252_signals,
-        'results': sma_252_results,
-        'metrics': sma_252_metrics,
-        'description': 'Industry-standard SMA trend filter'
-    }
+    return results
 
-    # 4. ALTERNATIVE 2: Relative Momentum (top 3)
-    print("Running ALTERNATIVE 2: Relative Momentum...")
-    rel_mom_signals = generate_signals(prices, method='relative', lookback=252, top_n=3)
-    rel_mom_results = calculate_strategy_returns(
-        prices,
-        rel_mom_signals,
-        transaction_cost=0.0005,
-        rebalance_frequency='M'
-    )
-    rel_mom_metrics = calculate_performance_metrics(rel_mom_results['returns'])
-    results['Relative Momentum (top 3)'] = {
-        'signals': rel_mom_signals,
-        'results': rel_mom_results,
-        'metrics': rel_mom_metrics,
-        'description': 'Cross-sectional momentum ranking'
-    }
 
-    # 5. BENCHMARK: Buy & Hold
-    print("Running BENCHMARK: Buy & Hold...")
-    bh_signals = pd.DataFrame(1.0, index=prices.index, columns=prices.columns)
-    bh_results = calculate_strategy_returns(
-        prices,
-        bh_signals,
-        transaction_cost=0.0,
-        rebalance_frequency='M'
-    )
-    bh_metrics = calculate_performance_metrics(bh_results['returns'])
-    results['Buy & Hold (Benchmark)'] = {
-        'signals': bh_signals,
-        'results': bh_results,
-        'metrics': bh_metrics,
-        'description': 'Passive equal-weight benchmark'
+def create_summary_table(results: dict) -> pd.DataFrame:
+    """Create comprehensive performance summary table, best Sharpe first."""
+    metric_columns = {
+        'Total Return': 'total_return',
+        'Ann. Return': 'annualized_return',
+        'Volatility': 'annualized_volatility',
+        'Sharpe Ratio': 'sharpe_ratio',
+        'Sortino Ratio': 'sortino_ratio',
+        'Max Drawdown': 'max_drawdown',
+        'Calmar Ratio': 'calmar_ratio',
+        'Win Rate': 'win_rate',
     }
+    n = len(results)
+    columns = {'Strategy': list(results)}
+    for column in metric_columns:
+        columns[column] = np.empty(n)
+    columns['Avg Positions'] = np.empty(n)
+    columns['Description'] = []
+
+    for i, data in enumerate(results.values()):
+        metrics = data['metrics']
+        for column, key in metric_columns.items():
+            columns[column][i] = metrics[key]
+        columns['Avg Positions'][i] = data['signals'].sum(axis=1).mean()
+        columns['Description'].append(data['description'])
 
-    return results
+    order = np.argsort(-columns['Sharpe Ratio'], kind='stable')
+    return pd.DataFrame(columns).iloc[order]
 
 
-def create_summary_table(results: dict) -> pd.DataFrame:
-    """Create comprehensive performance summary table."""
-    summary_data = []
+def compound(returns: pd.Series, rule: str) -> pd.Series:
+    """Compounded return per resample period, (1 + r).prod() - 1 via log-sum."""
+    return np.expm1(np.log1p(returns).resample(rule).sum())
 
-    for strategy_name, data in results.items():
-        metrics = data['metrics']
-        row = {
-            'Strategy': strategy_name,
-            'Total Return': metrics['total_return'],
-            'Ann. Return': metrics['annualized_return'],
-            'Volatility': metrics['annualized_volatility'],
-            'Sharpe Ratio': metrics['sharpe_ratio'],
-            'Sortino Ratio': metrics['sortino_ratio'],
-            'Max Drawdown': metrics['max_drawdown'],
-            'Calmar Ratio': metrics['calmar_ratio'],
-            'Win Rate': metrics['win_rate'],
-            'Avg Positions': data['signals'].sum(axis=1).mean(),
-            'Description': data['description']
-        }
-        summary_data.append(row)
 
-    df = pd.DataFrame(summary_data)
-    return df.sort_values('Sharpe Ratio', ascending=False)
+def thin_positions(n: int, max_points: int = 800) -> np.ndarray:
+    """
+    Evenly spaced row positions (first and last always kept) so a daily
+    line is drawn with at most ~max_points vertices; the 20-inch-wide
+    panels cannot resolve more than that.
+    """
+    step = max(1, n // max_points)
+    return np.unique(np.r_[np.arange(0, n, step), n - 1])
 
 
 def calculate_improvement_metrics(final_metrics: dict, benchmark_metrics: dict) -> dict:
@@ -167,6 +162,20 @@ def calculate_improvement_metrics(final_metrics: dict, benchmark_metrics: dict)
     }
 
 
+def plot_strategy_lines(ax, dates, values: np.ndarray, names: list,
+                        linewidth: float, final_linewidth: float, alpha: float = 1.0):
+    """
+    Draw one line per column of values with a single ax.plot call, then
+    emphasize the Final Strategy line.
+    """
+    lines = ax.plot(dates, values, label=names, linewidth=linewidth, alpha=alpha, rasterized=True)
+    for line, name in zip(lines, names):
+        if 'Final Strategy' in name:
+            line.set_linewidth(final_linewidth)
+            line.set_alpha(1.0)
+    return lines
+
+
 def plot_comprehensive_summary(results: dict, summary_df: pd.DataFrame, output_path: Path):
     """Create comprehensive final strategy summary visualization."""
     fig = plt.figure(figsize=(20, 14))
@@ -176,11 +185,11 @@ def plot_comprehensive_summary(results: dict, summary_df: pd.DataFrame, output_p
 
     # 1. Cumulative Returns Comparison
     ax1 = plt.subplot(3, 4, 1)
-    for strategy_name, data in results.items():
-        equity = data['results']['portfolio_value']
-        linewidth = 3 if 'Final Strategy' in strategy_name else 1.5
-        alpha = 1.0 if 'Final Strategy' in strategy_name else 0.7
-        ax1.plot(equity.index, equity.values, label=strategy_name, linewidth=linewidth, alpha=alpha)
+    names = list(results)
+    equity = np.column_stack([data['results']['portfolio_value'].to_numpy() for data in results.values()])
+    keep = thin_positions(len(equity))
+    plot_strategy_lines(ax1, final_strategy['results'].index[keep], equity[keep], names,
+                        linewidth=1.5, final_linewidth=3, alpha=0.7)
     ax1.set_ylabel('Portfolio Value ($)')
     ax1.set_title('Cumulative Returns: All Strategies', fontweight='bold', fontsize=11)
     ax1.legend(fontsize=8, loc='upper left')
@@ -188,25 +197,26 @@ def plot_comprehensive_summary(results: dict, summary_df: pd.DataFrame, output_p
 
     # 2. Final Strategy vs Benchmark Only
     ax2 = plt.subplot(3, 4, 2)
-    final_equity = final_strategy['results']['portfolio_value']
-    bench_equity = benchmark['results']['portfolio_value']
-    ax2.plot(final_equity.index, final_equity.values, 'b-', linewidth=3, label='Final Strategy (EMA 126d)')
-    ax2.plot(bench_equity.index, bench_equity.values, 'r--', linewidth=2, label='Buy & Hold', alpha=0.7)
+    keep = thin_positions(len(final_strategy['results']['portfolio_value']))
+    final_equity = final_strategy['results']['portfolio_value'].iloc[keep]
+    bench_equity = benchmark['results']['portfolio_value'].iloc[keep]
+    ax2.plot(final_equity.index, final_equity.values, 'b-', linewidth=3, label='Final Strategy (EMA 126d)',
+             rasterized=True)
+    ax2.plot(bench_equity.index, bench_equity.values, 'r--', linewidth=2, label='Buy & Hold', alpha=0.7,
+             rasterized=True)
     ax2.fill_between(final_equity.index, final_equity.values, bench_equity.values,
                       where=(final_equity.values >= bench_equity.values),
-                      alpha=0.3, color='green', label='Outperformance')
+                      alpha=0.3, color='green', label='Outperformance', rasterized=True)
     ax2.set_ylabel('Portfolio Value ($)')
     ax2.set_title('Final Strategy vs Benchmark', fontweight='bold', fontsize=11)
     ax2.legend(fontsize=9)
     ax2.grid(True, alpha=0.3)
 
-    # 3. Drawdown Comparison
+    # 3. Drawdown Comparison (weekly troughs, so no drawdown spike is lost)
     ax3 = plt.subplot(3, 4, 3)
-    for strategy_name, data in results.items():
-        returns = data['results']['returns']
-        dd = calculate_drawdown_series(returns)
-        linewidth = 2.5 if 'Final Strategy' in strategy_name else 1
-        ax3.plot(dd.index, dd.values * 100, label=strategy_name, linewidth=linewidth)
+    weekly_dd = pd.DataFrame({name: data['dd'] for name, data in results.items()}).resample('W').min()
+    plot_strategy_lines(ax3, weekly_dd.index, weekly_dd.to_numpy() * 100, names,
+                        linewidth=1, final_linewidth=2.5)
     ax3.set_ylabel('Drawdown (%)')
     ax3.set_title('Drawdown Evolution', fontweight='bold', fontsize=11)
     ax3.legend(fontsize=8, loc='lower left')
@@ -223,7 +233,7 @@ def plot_comprehensive_summary(results: dict, summary_df: pd.DataFrame, output_p
 
     # 5. Monthly Returns Distribution (Final Strategy)
     ax5 = plt.subplot(3, 4, 5)
-    monthly_returns = final_strategy['results']['returns'].resample('ME').apply(lambda x: (1 + x).prod() - 1)
+    monthly_returns = compound(final_strategy['results']['returns'], 'ME')
     ax5.hist(monthly_returns * 100, bins=30, color='steelblue', alpha=0.7, edgecolor='black')
     ax5.axvline(monthly_returns.mean() * 100, color='red', linestyle='--', linewidth=2, label=f'Mean: {monthly_returns.mean()*100:.1f}%')
     ax5.axvline(0, color='black', linestyle='-', linewidth=1)
@@ -235,13 +245,15 @@ def plot_comprehensive_summary(results: dict, summary_df: pd.DataFrame, output_p
 
     # 6. Rolling Sharpe Ratio (252-day)
     ax6 = plt.subplot(3, 4, 6)
-    for strategy_name, data in results.items():
-        if 'Benchmark' in strategy_name:
-            continue
-        returns = data['results']['returns']
-        rolling_sharpe = returns.rolling(252).mean() / returns.rolling(252).std() * np.sqrt(252)
-        linewidth = 2.5 if 'Final Strategy' in strategy_name else 1
-        ax6.plot(rolling_sharpe.index, rolling_sharpe.values, label=strategy_name, linewidth=linewidth)
+    sharpe_names = [name for name in results if 'Benchmark' not in name]
+    sharpe_returns = pd.DataFrame({name: results[name]['results']['returns']
+                                   for name in sharpe_names})
+    sharpe = calculate_rolling_sharpe(sharpe_returns, 252)
+    keep = thin_positions(len(sharpe))
+    sharpe_dates = sharpe.index[keep]
+    sharpe_values = sharpe.to_numpy()[keep]
+    plot_strategy_lines(ax6, sharpe_dates, sharpe_values, sharpe_names,
+                        linewidth=1, final_linewidth=2.5)
     ax6.axhline(y=0, color='black', linestyle='--', linewidth=0.5)
     ax6.axhline(y=1.0, color='green', linestyle=':', linewidth=0.5, alpha=0.5, label='Target: 1.0')
     ax6.set_ylabel('Rolling Sharpe (252d)')
@@ -251,8 +263,8 @@ def plot_comprehensive_summary(results: dict, summary_df: pd.DataFrame, output_p
 
     # 7. Underwater Plot (Final Strategy)
     ax7 = plt.subplot(3, 4, 7)
-    final_dd = calculate_drawdown_series(final_strategy['results']['returns'])
-    ax7.fill_between(final_dd.index, 0, final_dd.values * 100, color='red', alpha=0.5)
+    final_dd = final_strategy['dd'].resample('W').min()
+    ax7.fill_between(final_dd.index, 0, final_dd.values * 100, color='red', alpha=0.5, rasterized=True)
     ax7.set_ylabel('Drawdown (%)')
     ax7.set_title('Underwater Plot (Final Strategy)', fontweight='bold', fontsize=11)
     ax7.grid(True, alpha=0.3)
@@ -260,7 +272,7 @@ def plot_comprehensive_summary(results: dict, summary_df: pd.DataFrame, output_p
     # 8. Signal Activity (Final Strategy)
     ax8 = plt.subplot(3, 4, 8)
     signal_counts = final_strategy['signals'].sum(axis=1)
-    ax8.plot(signal_counts.index, signal_counts.values, linewidth=1, alpha=0.7)
+    ax8.plot(signal_counts.index, signal_counts.values, linewidth=1, alpha=0.7, rasterized=True)
     ax8.axhline(y=signal_counts.mean(), color='red', linestyle='--', linewidth=2,
                 label=f'Avg: {signal_counts.mean():.1f} positions')
     ax8.set_ylabel('Number of Positions')
@@ -270,8 +282,8 @@ def plot_comprehensive_summary(results: dict, summary_df: pd.DataFrame, output_p
 
     # 9. Annual Returns Comparison
     ax9 = plt.subplot(3, 4, 9)
-    final_annual = final_strategy['results']['returns'].resample('YE').apply(lambda x: (1 + x).prod() - 1)
-    bench_annual = benchmark['results']['returns'].resample('YE').apply(lambda x: (1 + x).prod() - 1)
+    final_annual = compound(final_strategy['results']['returns'], 'YE')
+    bench_annual = compound(benchmark['results']['returns'], 'YE')
     years = final_annual.index.year
     x = np.arange(len(years))
     width = 0.35
@@ -307,14 +319,13 @@ def plot_comprehensive_summary(results: dict, summary_df: pd.DataFrame, output_p
         linewidth=2,
         alpha=0.7
     )
-    for idx, row in summary_df.iterrows():
-        label = 'FINAL' if 'Final Strategy' in row['Strategy'] else row['Strategy'].split('(')[0].strip()
-        fontweight = 'bold' if 'Final Strategy' in row['Strategy'] else 'normal'
-        fontsize = 10 if 'Final Strategy' in row['Strategy'] else 8
+    for strategy, vol, ret in zip(summary_df['Strategy'], summary_df['Volatility'], summary_df['Ann. Return']):
+        is_final = 'Final Strategy' in strategy
+        label = 'FINAL' if is_final else strategy.split('(')[0].strip()
         ax11.annotate(label,
-                      (row['Volatility'] * 100, row['Ann. Return'] * 100),
-                      fontsize=fontsize,
-                      fontweight=fontweight,
+                      (vol * 100, ret * 100),
+                      fontsize=10 if is_final else 8,
+                      fontweight='bold' if is_final else 'normal',
                       ha='right')
     ax11.set_xlabel('Annualized Volatility (%)')
     ax11.set_ylabel('Annualized Return (%)')
@@ -360,12 +371,36 @@ Status: PRODUCTION READY ✓
     ax12.text(0.1, 0.5, summary_text, fontsize=9, family='monospace',
               verticalalignment='center', fontweight='bold')
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    # tight_layout already fits the long bar labels; bbox_inches='tight'
+    # would render all twelve panels a second time just to crop
+    plt.tight_layout(rect=(0, 0, 0.985, 1))
+    plt.savefig(output_path, dpi=PLOT_DPI, metadata={'Software': None})
     print(f"\nComprehensive visualization saved to: {output_path}")
     plt.close()
 
 
+def format_metrics_block(metrics: dict, sharpe_note: str = '') -> str:
+    """Format the eight headline metrics as aligned report lines."""
+    total_return = metrics['total_return']
+    annualized_return = metrics['annualized_return']
+    volatility = metrics['annualized_volatility']
+    sharpe = metrics['sharpe_ratio']
+    sortino = metrics['sortino_ratio']
+    max_drawdown = metrics['max_drawdown']
+    calmar = metrics['calmar_ratio']
+    win_rate = metrics['win_rate']
+    return (
+        f"  Total Return:        {total_return*100:>8.1f}%\n"
+        f"  Annualized Return:   {annualized_return*100:>8.2f}%\n"
+        f"  Volatility:          {volatility*100:>8.2f}%\n"
+        f"  Sharpe Ratio:        {sharpe:>8.3f}{sharpe_note}\n"
+        f"  Sortino Ratio:       {sortino:>8.3f}\n"
+        f"  Maximum Drawdown:    {max_drawdown*100:>8.2f}%\n"
+        f"  Calmar Ratio:        {calmar:>8.3f}\n"
+        f"  Win Rate:            {win_rate*100:>8.1f}%"
+    )
+
+
 def generate_executive_summary(results: dict, summary_df: pd.DataFrame) -> str:
     """Generate executive summary text report."""
     final_strategy = results['Final Strategy (EMA 126d)']
@@ -379,7 +414,14 @@ def generate_executive_summary(results: dict, summary_df: pd.DataFrame) -> str:
     vs_benchmark = calculate_improvement_metrics(final_metrics, bench_metrics)
     vs_initial = calculate_improvement_metrics(final_metrics, initial_metrics)
 
-    report = f"""
+    # Values referenced more than once below
+    total_return = final_metrics['total_return']
+    max_drawdown = final_metrics['max_drawdown']
+    avg_win = final_metrics['avg_win']
+    avg_loss = final_metrics['avg_loss']
+    avg_positions = final_strategy['signals'].sum(axis=1).mean()
+
+    parts = [f"""
 {'='*80}
 MULTI-ASSET TREND-FOLLOWING STRATEGY
 FINAL PERFORMANCE SUMMARY
@@ -407,31 +449,17 @@ Risk Management:
   • Transaction costs: 5 basis points per trade
   • Monthly rebalancing to control turnover
   • Maximum 5 positions (full universe)
-  • Average positions: {final_strategy['signals'].sum(axis=1).mean():.1f}
+  • Average positions: {avg_positions:.1f}
 
 {'='*80}
 2. PERFORMANCE METRICS
 {'='*80}
 
 FINAL STRATEGY (EMA 126d):
-  Total Return:        {final_metrics['total_return']*100:>8.1f}%
-  Annualized Return:   {final_metrics['annualized_return']*100:>8.2f}%
-  Volatility:          {final_metrics['annualized_volatility']*100:>8.2f}%
-  Sharpe Ratio:        {final_metrics['sharpe_ratio']:>8.3f}  ⭐⭐⭐
-  Sortino Ratio:       {final_metrics['sortino_ratio']:>8.3f}
-  Maximum Drawdown:    {final_metrics['max_drawdown']*100:>8.2f}%
-  Calmar Ratio:        {final_metrics['calmar_ratio']:>8.3f}
-  Win Rate:            {final_metrics['win_rate']*100:>8.1f}%
+{format_metrics_block(final_metrics, sharpe_note='  ⭐⭐⭐')}
 
 BUY & HOLD BENCHMARK:
-  Total Return:        {bench_metrics['total_return']*100:>8.1f}%
-  Annualized Return:   {bench_metrics['annualized_return']*100:>8.2f}%
-  Volatility:          {bench_metrics['annualized_volatility']*100:>8.2f}%
-  Sharpe Ratio:        {bench_metrics['sharpe_ratio']:>8.3f}
-  Sortino Ratio:       {bench_metrics['sortino_ratio']:>8.3f}
-  Maximum Drawdown:    {bench_metrics['max_drawdown']*100:>8.2f}%
-  Calmar Ratio:        {bench_metrics['calmar_ratio']:>8.3f}
-  Win Rate:            {bench_metrics['win_rate']*100:>8.1f}%
+{format_metrics_block(bench_metrics)}
 
 {'='*80}
 3. PERFORMANCE vs BENCHMARKS
@@ -449,26 +477,33 @@ vs INITIAL STRATEGY (EMA 252d):
   Drawdown Change:       {vs_initial['dd_improvement']*100:+.1f}%
 
 RANKING (by Sharpe Ratio):
-"""
+"""]
 
-    for idx, (_, row) in enumerate(summary_df.iterrows(), 1):
-        medal = "🥇" if idx == 1 else "🥈" if idx == 2 else "🥉" if idx == 3 else "  "
-        report += f"  {medal} {idx}. {row['Strategy']:<35} Sharpe: {row['Sharpe Ratio']:.3f}\n"
+    medals = {1: "🥇", 2: "🥈", 3: "🥉"}
+    parts.extend(
+        f"  {medals.get(idx, '  ')} {idx}. {strategy:<35} Sharpe: {sharpe:.3f}\n"
+        for idx, (strategy, sharpe) in enumerate(zip(summary_df['Strategy'], summary_df['Sharpe Ratio']), 1)
+    )
 
     # Calculate monthly stats
-    monthly_returns = final_strategy['results']['returns'].resample('ME').apply(lambda x: (1 + x).prod() - 1)
+    monthly_returns = compound(final_strategy['results']['returns'], 'ME')
     positive_months = (monthly_returns > 0).sum()
     total_months = len(monthly_returns)
 
-    report += f"""
+    # Turnover statistics, from one pass over the turnover series
+    turnover = final_strategy['results']['turnover']
+    avg_monthly_turnover = turnover.resample('ME').sum().mean()
+    annual_cost = turnover.sum() * 0.0005 / 20
+
+    parts.append(f"""
 {'='*80}
 4. RISK ANALYSIS
 {'='*80}
 
 Drawdown Statistics:
-  Maximum Drawdown:      {final_metrics['max_drawdown']*100:.2f}%
-  Average Drawdown:      {calculate_drawdown_series(final_strategy['results']['returns']).mean()*100:.2f}%
-  Recovery Factor:       {final_metrics['total_return'] / abs(final_metrics['max_drawdown']):.2f}
+  Maximum Drawdown:      {max_drawdown*100:.2f}%
+  Average Drawdown:      {final_strategy['dd'].mean()*100:.2f}%
+  Recovery Factor:       {total_return / abs(max_drawdown):.2f}
 
 Return Distribution:
   Best Month:            {monthly_returns.max()*100:.2f}%
@@ -478,9 +513,9 @@ Return Distribution:
   Positive Months:       {positive_months}/{total_months} ({positive_months/total_months*100:.1f}%)
 
 Tail Risk:
-  Average Win:           {final_metrics['avg_win']*100:.3f}%
-  Average Loss:          {final_metrics['avg_loss']*100:.3f}%
-  Win/Loss Ratio:        {abs(final_metrics['avg_win']/final_metrics['avg_loss']):.2f}
+  Average Win:           {avg_win*100:.3f}%
+  Average Loss:          {avg_loss*100:.3f}%
+  Win/Loss Ratio:        {abs(avg_win/avg_loss):.2f}
 
 {'='*80}
 5. OPTIMIZATION JOURNEY
@@ -513,12 +548,12 @@ Execution Frequency:
 
 Transaction Costs:
   Assumption: 5 basis points per trade
-  Average monthly turnover: {final_strategy['results']['turnover'].resample('ME').sum().mean()*100:.1f}%
-  Estimated annual costs: ~{final_strategy['results']['turnover'].sum() * 0.0005 / 20 * 100:.2f}% of portfolio
+  Average monthly turnover: {avg_monthly_turnover*100:.1f}%
+  Estimated annual costs: ~{annual_cost * 100:.2f}% of portfolio
 
 Position Limits:
   Maximum positions: 5 (full universe)
-  Typical positions: {final_strategy['signals'].sum(axis=1).mean():.1f}
+  Typical positions: {avg_positions:.1f}
   Minimum position size: 20% (when 5 assets active)
 
 {'='*80}
@@ -564,9 +599,9 @@ and systematic risk monitoring.
 {'='*80}
 END OF REPORT
 {'='*80}
-"""
+""")
 
-    return report
+    return ''.join(parts)
 
 
 def main():
@@ -577,7 +612,7 @@ def main():
 
     # Load data
     data_path = project_root / 'data' / 'processed' / 'prices_clean.csv'
-    prices = pd.read_csv(data_path, index_col=0, parse_dates=True)
+    prices = load_prices(data_path)
 
     print(f"\nData loaded: {prices.shape[0]} days, {prices.shape[1]} assets")
     print(f"Date range: {prices.index.min().date()} to {prices.index.max().date()}")
@@ -595,7 +630,8 @@ def main():
     print("=" * 80)
     display_cols = ['Strategy', 'Total Return', 'Ann. Return', 'Volatility',
                     'Sharpe Ratio', 'Sortino Ratio', 'Max Drawdown', 'Calmar Ratio']
-    print(summary_df[display_cols].to_string(index=False, float_format=lambda x: f'{x:.4f}'))
+    with pd.option_context('display.float_format', '{:.4f}'.format):
+        print(summary_df[display_cols].to_string(index=False))
 
     # Save results
     output_dir = project_root / 'outputs'
@@ -10,20 +10,38 @@ lookback period. Evaluates:
 - Drawdown characteristics
 
 Spans tested: 63d (3M), 126d (6M), 189d (9M), 252d (12M), 315d (15M), 378d (18M)
+
+Usage:
+    python scripts/optimize_ema_span.py             # Results, CSV and figure
+    python scripts/optimize_ema_span.py --no-plot   # Skip the figure (and matplotlib)
 """
 
 from pathlib import Path
 import sys
+import os
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Add project root to path
 project_root = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(project_root))
 
+from src.data.cache import load_prices
 from src.signals.trend_filter import generate_signals
-from src.backtest.engine import calculate_strategy_returns, calculate_performance_metrics
+from src.backtest.engine import calculate_strategy_returns_batch, calculate_performance_metrics
+
+# Figure resolution; set PLOT_DPI=300 for publication-quality output
+PLOT_DPI = int(os.environ.get('PLOT_DPI', 150))
+
+# Display labels for the standard spans; other spans show as '<n>d'
+SPAN_LABELS = {
+    63: '3M',
+    126: '6M',
+    189: '9M',
+    252: '12M (current)',
+    315: '15M',
+    378: '18M',
+}
 
 
 def optimize_ema_span(prices: pd.DataFrame, spans: list) -> pd.DataFrame:
@@ -42,53 +60,37 @@ def optimize_ema_span(prices: pd.DataFrame, spans: list) -> pd.DataFrame:
     pd.DataFrame
         Performance metrics for each span.
     """
-    results = []
-
+    # Signals differ only in the EMA span; everything downstream is
+    # shared, so all spans are backtested together in one pass
+    all_signals = []
     for span in spans:
         print(f"Testing EMA span = {span} days...")
-
-        # Generate signals
-        signals = generate_signals(prices, method='ema', span=span)
-
-        # Backtest
-        backtest_results = calculate_strategy_returns(
-            prices,
-            signals,
-            transaction_cost=0.0005,
-            rebalance_frequency='M'
-        )
-
-        # Calculate metrics
-        metrics = calculate_performance_metrics(backtest_results['returns'])
-
-        # Add span and label
-        metrics['span'] = span
-        if span == 63:
-            metrics['label'] = '3M'
-        elif span == 126:
-            metrics['label'] = '6M'
-        elif span == 189:
-            metrics['label'] = '9M'
-        elif span == 252:
-            metrics['label'] = '12M (current)'
-        elif span == 315:
-            metrics['label'] = '15M'
-        elif span == 378:
-            metrics['label'] = '18M'
-        else:
-            metrics['label'] = f'{span}d'
-
-        # Calculate additional statistics
-        avg_positions = signals.sum(axis=1).mean()
-        metrics['avg_positions'] = avg_positions
-
-        # Calculate average turnover
-        monthly_turnover = backtest_results['turnover'].resample('ME').sum().mean()
-        metrics['avg_turnover'] = monthly_turnover
-
-        results.append(metrics)
-
-    return pd.DataFrame(results)
+        all_signals.append(generate_signals(prices, method='ema', span=span))
+
+    all_backtests = calculate_strategy_returns_batch(
+        prices,
+        all_signals,
+        transaction_cost=0.0005,
+        rebalance_frequency='M'
+    )
+
+    # Assemble the table column by column rather than row dicts
+    all_metrics = [calculate_performance_metrics(bt['returns']) for bt in all_backtests]
+    results_df = pd.DataFrame({key: [m[key] for m in all_metrics] for key in all_metrics[0]})
+    results_df['span'] = spans
+    results_df['label'] = [SPAN_LABELS.get(span, f'{span}d') for span in spans]
+    results_df['avg_positions'] = [signals.sum(axis=1).mean() for signals in all_signals]
+
+    # Average monthly turnover: on a (span, day) array, sum each calendar
+    # month's run of days for all spans at once, then average over months
+    index = prices.index
+    month_id = index.year * 12 + index.month
+    month_starts = np.flatnonzero(np.r_[True, np.diff(month_id) != 0])
+    turnover = np.vstack([bt['turnover'].to_numpy() for bt in all_backtests])
+    monthly_turnover = np.add.reduceat(turnover, month_starts, axis=1)
+    results_df['avg_turnover'] = monthly_turnover.mean(axis=1)
+
+    return results_df
 
 
 def analyze_robustness(results_df: pd.DataFrame) -> dict:
@@ -126,10 +128,14 @@ def analyze_robustness(results_df: pd.DataFrame) -> dict:
 
 def plot_optimization_results(results_df: pd.DataFrame, robustness: dict, output_path: Path):
     """Create comprehensive visualization of optimization results."""
-    fig = plt.figure(figsize=(16, 12))
+    # Imported here so --no-plot runs never pay for matplotlib
+    import matplotlib
+    matplotlib.use('Agg')  # Headless: only saves PNG, never shows a window
+    import matplotlib.pyplot as plt
+
+    fig, ((ax1, ax2, ax3), (ax4, ax5, ax6), (ax7, ax8, ax9)) = plt.subplots(3, 3, figsize=(16, 12))
 
     # 1. Sharpe Ratio vs Span
-    ax1 = plt.subplot(3, 3, 1)
     ax1.plot(results_df['span'], results_df['sharpe_ratio'], 'o-', linewidth=2, markersize=8)
     best_idx = results_df['sharpe_ratio'].idxmax()
     ax1.plot(results_df.loc[best_idx, 'span'], results_df.loc[best_idx, 'sharpe_ratio'],
@@ -141,7 +147,6 @@ def plot_optimization_results(results_df: pd.DataFrame, robustness: dict, output
     ax1.legend()
 
     # 2. Total Return vs Span
-    ax2 = plt.subplot(3, 3, 2)
     ax2.plot(results_df['span'], results_df['total_return'] * 100, 'o-',
              linewidth=2, markersize=8, color='green')
     best_return_idx = results_df['total_return'].idxmax()
@@ -155,7 +160,6 @@ def plot_optimization_results(results_df: pd.DataFrame, robustness: dict, output
     ax2.legend()
 
     # 3. Max Drawdown vs Span
-    ax3 = plt.subplot(3, 3, 3)
     ax3.plot(results_df['span'], results_df['max_drawdown'] * 100, 'o-',
              linewidth=2, markersize=8, color='red')
     best_dd_idx = results_df['max_drawdown'].idxmax()  # Closest to 0
@@ -169,7 +173,6 @@ def plot_optimization_results(results_df: pd.DataFrame, robustness: dict, output
     ax3.legend()
 
     # 4. Risk-Return Scatter
-    ax4 = plt.subplot(3, 3, 4)
     scatter = ax4.scatter(results_df['annualized_volatility'] * 100,
                           results_df['annualized_return'] * 100,
                           c=results_df['sharpe_ratio'],
@@ -177,19 +180,17 @@ def plot_optimization_results(results_df: pd.DataFrame, robustness: dict, output
                           cmap='RdYlGn',
                           edgecolors='black',
                           linewidth=2)
-    for idx, row in results_df.iterrows():
-        ax4.annotate(row['label'],
-                     (row['annualized_volatility'] * 100, row['annualized_return'] * 100),
-                     fontsize=9,
-                     ha='right')
+    for label, vol, ret in zip(results_df['label'],
+                               results_df['annualized_volatility'] * 100,
+                               results_df['annualized_return'] * 100):
+        ax4.annotate(label, (vol, ret), fontsize=9, ha='right')
     ax4.set_xlabel('Volatility (%)')
     ax4.set_ylabel('Annualized Return (%)')
     ax4.set_title('Risk-Return Trade-off (color = Sharpe)')
     ax4.grid(True, alpha=0.3)
-    plt.colorbar(scatter, ax=ax4, label='Sharpe Ratio')
+    fig.colorbar(scatter, ax=ax4, label='Sharpe Ratio')
 
     # 5. Calmar Ratio vs Span
-    ax5 = plt.subplot(3, 3, 5)
     ax5.plot(results_df['span'], results_df['calmar_ratio'], 'o-',
              linewidth=2, markersize=8, color='purple')
     best_calmar_idx = results_df['calmar_ratio'].idxmax()
@@ -203,7 +204,6 @@ def plot_optimization_results(results_df: pd.DataFrame, robustness: dict, output
     ax5.legend()
 
     # 6. Sortino Ratio vs Span
-    ax6 = plt.subplot(3, 3, 6)
     ax6.plot(results_df['span'], results_df['sortino_ratio'], 'o-',
              linewidth=2, markersize=8, color='orange')
     best_sortino_idx = results_df['sortino_ratio'].idxmax()
@@ -217,7 +217,6 @@ def plot_optimization_results(results_df: pd.DataFrame, robustness: dict, output
     ax6.legend()
 
     # 7. Average Positions vs Span
-    ax7 = plt.subplot(3, 3, 7)
     ax7.plot(results_df['span'], results_df['avg_positions'], 'o-',
              linewidth=2, markersize=8, color='teal')
     ax7.set_xlabel('EMA Span (days)')
@@ -226,7 +225,6 @@ def plot_optimization_results(results_df: pd.DataFrame, robustness: dict, output
     ax7.grid(True, alpha=0.3)
 
     # 8. Performance Metrics Comparison (Bar Chart)
-    ax8 = plt.subplot(3, 3, 8)
     x = np.arange(len(results_df))
     width = 0.35
     ax8.bar(x - width/2, results_df['sharpe_ratio'], width, label='Sharpe', alpha=0.8)
@@ -240,7 +238,6 @@ def plot_optimization_results(results_df: pd.DataFrame, robustness: dict, output
     ax8.grid(True, alpha=0.3, axis='y')
 
     # 9. Robustness Summary (Text)
-    ax9 = plt.subplot(3, 3, 9)
     ax9.axis('off')
 
     robustness_text = f"""
@@ -269,10 +266,10 @@ Status: {"ROBUST" if robustness['sharpe_cv'] < 10 else "MODERATE" if robustness[
     ax9.text(0.1, 0.5, robustness_text, fontsize=10, family='monospace',
              verticalalignment='center')
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=PLOT_DPI, metadata={'Software': None})
     print(f"\nVisualization saved to: {output_path}")
-    plt.close()
+    plt.close(fig)
 
 
 def main():
@@ -283,7 +280,7 @@ def main():
 
     # Load data
     data_path = project_root / 'data' / 'processed' / 'prices_clean.csv'
-    prices = pd.read_csv(data_path, index_col=0, parse_dates=True)
+    prices = load_prices(data_path)
 
     print(f"\nData loaded: {prices.shape[0]} days, {prices.shape[1]} assets")
     print(f"Date range: {prices.index.min().date()} to {prices.index.max().date()}")
@@ -315,8 +312,9 @@ def main():
     print(f"\nResults saved to: {csv_path}")
 
     # Create visualization
-    plot_path = output_dir / 'ema_optimization.png'
-    plot_optimization_results(results_df, robustness, plot_path)
+    if "--no-plot" not in sys.argv[1:]:
+        plot_path = output_dir / 'ema_optimization.png'
+        plot_optimization_results(results_df, robustness, plot_path)
 
     # Print key insights
     print("\n" + "=" * 70)
@@ -3,27 +3,178 @@ Optimize SMA lookback period for trend-following strategy.
 
 Tests multiple lookback windows to find optimal parameter while
 being mindful of overfitting risks.
+
+Usage:
+    python scripts/optimize_sma_lookback.py             # Results, CSV and figure
+    python scripts/optimize_sma_lookback.py --no-plot   # Skip the figure (and matplotlib)
 """
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from pathlib import Path
 import sys
+import os
 
 project_root = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(project_root))
 
+from src.data.cache import cached, file_key, load_prices
 from src.signals.trend_filter import generate_signals
-from src.backtest.engine import backtest_strategy
+from src.backtest.engine import calculate_strategy_returns_batch, calculate_performance_metrics
+
+# Figure resolution; set PLOT_DPI=300 for publication-quality output
+PLOT_DPI = int(os.environ.get('PLOT_DPI', 150))
+
+
+def run_sweep(prices, lookbacks, backtest_params):
+    """SMA signals for every lookback, backtested together in one engine pass."""
+    all_signals = [generate_signals(prices, method='sma', window=lookback)
+                   for lookback in lookbacks]
+    return calculate_strategy_returns_batch(prices, all_signals, **backtest_params)
+
+
+def make_plots(prices, results, summary_df, lookback_periods, period_labels, output_dir):
+    """Draw the 3x3 sweep figure and save it to output_dir/sma_optimization.png."""
+    # Imported here so --no-plot runs never pay for matplotlib
+    import matplotlib
+    matplotlib.use('Agg')  # Headless: only saves PNG, never shows a window
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=(18, 12))
+    gs = fig.add_gridspec(3, 3, hspace=0.35, wspace=0.3)
+
+    # Color map for different lookbacks
+    colors = plt.cm.viridis(np.linspace(0, 1, len(lookback_periods)))
+
+    # 1. Cumulative returns comparison (large, spans 2 columns)
+    ax1 = fig.add_subplot(gs[0, :2])
+    # Draw every ~n/800th day (first and last kept): the panel cannot resolve
+    # more, and the daily lines are rasterized rather than kept as vectors
+    n_days = len(prices)
+    keep = np.unique(np.r_[np.arange(0, n_days, max(1, n_days // 800)), n_days - 1])
+    # Growth of 1.0 for every lookback at once: one cumprod down a (day, lookback) matrix
+    daily_returns = np.column_stack([results[lookback]['portfolio_stats']['returns'].to_numpy()
+                                     for lookback in lookback_periods])
+    cum_returns = np.cumprod(1 + daily_returns, axis=0)[keep]
+    plot_dates = prices.index[keep]
+    for i, lookback in enumerate(lookback_periods):
+        label = f'{lookback}d ({period_labels[lookback]})'
+        linewidth = 2.5 if lookback == 252 else 1.5
+        alpha = 1.0 if lookback == 252 else 0.7
+        ax1.plot(plot_dates, cum_returns[:, i], label=label,
+                 linewidth=linewidth, color=colors[i], alpha=alpha, rasterized=True)
+
+    ax1.set_title('Cumulative Returns: All Lookback Periods', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Cumulative Return (Initial = 1.0)', fontsize=11)
+    ax1.legend(loc='upper left', fontsize=9)
+    ax1.grid(True, alpha=0.3)
+    ax1.axhline(y=1.0, color='black', linestyle='-', linewidth=0.5)
+
+    # Highlight baseline (252 days)
+    textstr = f'Baseline (252d): {results[252]["performance_metrics"]["total_return"]:.1%}'
+    ax1.text(0.02, 0.98, textstr, transform=ax1.transAxes, fontsize=10,
+            verticalalignment='top', bbox=dict(boxstyle='round', facecolor='yellow', alpha=0.7))
+
+    # 2-5. One bar panel per metric: bars in lookback order, best bar
+    # highlighted, value printed on top of each bar
+    bar_panels = [
+        # (grid cell, values, best position, highlight fill/edge, label format, title, y label)
+        (gs[0, 2], summary_df['sharpe_ratio'].to_numpy(),
+         summary_df['sharpe_ratio'].to_numpy().argmax(), ('gold', 'red'), '{:.2f}',
+         'Sharpe Ratio by Lookback', 'Sharpe Ratio'),
+        (gs[1, 0], summary_df['max_drawdown'].abs().to_numpy() * 100,
+         summary_df['max_drawdown'].abs().to_numpy().argmin(), ('lightgreen', 'darkgreen'), '{:.1f}%',
+         'Max Drawdown by Lookback', 'Max Drawdown (%)'),
+        (gs[1, 1], summary_df['annualized_return'].to_numpy() * 100,
+         summary_df['annualized_return'].to_numpy().argmax(), ('gold', 'red'), '{:.1f}%',
+         'Annualized Return by Lookback', 'Annualized Return (%)'),
+        (gs[1, 2], summary_df['calmar_ratio'].to_numpy(),
+         summary_df['calmar_ratio'].to_numpy().argmax(), ('gold', 'red'), '{:.2f}',
+         'Calmar Ratio by Lookback', 'Calmar Ratio'),
+    ]
+    for cell, values, best_pos, (best_fill, best_edge), fmt, title, ylabel in bar_panels:
+        ax = fig.add_subplot(cell)
+        bars = ax.bar(range(len(values)), values, color=colors, alpha=0.8, edgecolor='black')
+        bars[best_pos].set_color(best_fill)
+        bars[best_pos].set_edgecolor(best_edge)
+        bars[best_pos].set_linewidth(2)
+        ax.bar_label(bars, fmt=fmt, fontsize=8)
+
+        ax.set_xticks(range(len(lookback_periods)))
+        ax.set_xticklabels([period_labels[p] for p in lookback_periods], fontsize=9)
+        ax.set_title(title, fontsize=12, fontweight='bold')
+        ax.set_ylabel(ylabel, fontsize=10)
+        ax.grid(True, alpha=0.3, axis='y')
+        ax.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
+
+    # 6. Return vs Risk scatter
+    ax6 = fig.add_subplot(gs[2, 0])
+    vols = summary_df['volatility'].to_numpy() * 100
+    rets = summary_df['annualized_return'].to_numpy() * 100
+    sizes = np.where(summary_df.index == 252, 200, 100)
+    ax6.scatter(vols, rets, s=sizes, color=colors, alpha=0.8, edgecolors='black', linewidths=1.5)
+    for lookback, vol, ret in zip(summary_df.index, vols, rets):
+        ax6.annotate(period_labels[lookback], (vol, ret), fontsize=8, ha='center', va='bottom')
+
+    ax6.set_xlabel('Volatility (%)', fontsize=10)
+    ax6.set_ylabel('Annualized Return (%)', fontsize=10)
+    ax6.set_title('Return vs Risk', fontsize=12, fontweight='bold')
+    ax6.grid(True, alpha=0.3)
+
+    # 7. Average positions by lookback
+    ax7 = fig.add_subplot(gs[2, 1])
+    avg_pos = summary_df['avg_positions']
+    ax7.bar(range(len(avg_pos)), avg_pos.values, color=colors, alpha=0.8, edgecolor='black')
+    ax7.set_xticks(range(len(lookback_periods)))
+    ax7.set_xticklabels([period_labels[p] for p in lookback_periods], fontsize=9)
+    ax7.set_title('Average Positions Held', fontsize=12, fontweight='bold')
+    ax7.set_ylabel('Number of Positions', fontsize=10)
+    ax7.set_ylim([0, 5.5])
+    ax7.grid(True, alpha=0.3, axis='y')
+
+    # 8. Metric sensitivity heatmap
+    ax8 = fig.add_subplot(gs[2, 2])
+    # Normalize metrics to 0-100 scale for comparison (higher is better, so
+    # drawdown enters as -|max drawdown|)
+    heat = summary_df[['annualized_return', 'sharpe_ratio', 'max_drawdown', 'calmar_ratio']].copy()
+    heat['max_drawdown'] = -heat['max_drawdown'].abs()
+    norm_metrics = (heat - heat.min()) / (heat.max() - heat.min()) * 100
+    norm_metrics.columns = ['Return', 'Sharpe', 'DD Control', 'Calmar']
+
+    im = ax8.imshow(norm_metrics.T.values, cmap='RdYlGn', aspect='auto', vmin=0, vmax=100)
+    ax8.set_xticks(range(len(lookback_periods)))
+    ax8.set_xticklabels([period_labels[p] for p in lookback_periods], fontsize=9)
+    ax8.set_yticks(range(len(norm_metrics.columns)))
+    ax8.set_yticklabels(norm_metrics.columns, fontsize=9)
+    ax8.set_title('Performance Heatmap\n(0=worst, 100=best)', fontsize=11, fontweight='bold')
+
+    # Add text annotations
+    for i in range(len(lookback_periods)):
+        for j in range(len(norm_metrics.columns)):
+            text = ax8.text(i, j, f'{norm_metrics.iloc[i, j]:.0f}',
+                           ha="center", va="center", color="black", fontsize=8)
+
+    plt.colorbar(im, ax=ax8, fraction=0.046, pad=0.04)
+
+    fig.suptitle('SMA Lookback Period Optimization (63 to 378 days)',
+                 fontsize=16, fontweight='bold', y=0.998)
+
+    # Fixed margins instead of bbox_inches='tight', which renders the figure twice
+    fig.subplots_adjust(left=0.05, right=0.97, top=0.93, bottom=0.05)
+    fig.savefig(output_dir / 'sma_optimization.png', dpi=PLOT_DPI, metadata={'Software': None})
+    print(f'Saved visualization to {output_dir / "sma_optimization.png"}')
+    plt.close(fig)
+
 
 print('=' * 80)
 print('SMA LOOKBACK PERIOD OPTIMIZATION')
 print('=' * 80)
 
-# Load data
-prices = pd.read_csv(project_root / 'data' / 'processed' / 'prices_clean.csv',
-                     index_col=0, parse_dates=True)
+# Load data; the parsed frame is cached in binary form so the CSV is only
+# read again when the file changes
+data_path = project_root / 'data' / 'processed' / 'prices_clean.csv'
+prices = load_prices(data_path)
+data_key = file_key(data_path)
 
 # Define lookback periods to test
 # 63 = 3 months, 126 = 6 months, 189 = 9 months, 252 = 12 months,
@@ -46,23 +197,26 @@ for period in lookback_periods:
 results = {}
 performance_summary = []
 
-# Run backtests for each lookback period
+# Run backtests for each lookback period. Only the signals depend on the
+# lookback, so all of them go through the engine's day loop in one pass;
+# reruns on unchanged data (e.g. while tweaking the plots) load the result
 print('\nRunning backtests...')
-for i, lookback in enumerate(lookback_periods, 1):
-    print(f'\n[{i}/{len(lookback_periods)}] Testing {lookback}-day SMA ({period_labels[lookback]})...')
+backtest_params = {'transaction_cost': 0.0005, 'rebalance_frequency': 'M'}
+all_stats = cached(('sma_sweep', data_key, tuple(lookback_periods), backtest_params),
+                   run_sweep, prices, lookback_periods, backtest_params)
 
-    # Generate signals
-    signals = generate_signals(prices, method='sma', window=lookback)
+# Row positions where each calendar month starts, for monthly turnover sums
+month_id = prices.index.year * 12 + prices.index.month
+month_starts = np.flatnonzero(np.r_[True, np.diff(month_id) != 0])
 
-    # Run backtest
-    result = backtest_strategy(
-        prices=prices,
-        signals=signals,
-        transaction_cost=0.0005,
-        rebalance_frequency='M'
-    )
+for i, (lookback, portfolio_stats) in enumerate(zip(lookback_periods, all_stats), 1):
+    print(f'\n[{i}/{len(lookback_periods)}] Testing {lookback}-day SMA ({period_labels[lookback]})...')
 
     # Store results
+    result = {
+        'portfolio_stats': portfolio_stats,
+        'performance_metrics': calculate_performance_metrics(portfolio_stats['returns']),
+    }
     results[lookback] = result
 
     # Extract key metrics
@@ -81,7 +235,7 @@ for i, lookback in enumerate(lookback_periods, 1):
         'calmar_ratio': metrics['calmar_ratio'],
         'win_rate': metrics['win_rate'],
         'avg_positions': stats['positions'].mean(),
-        'avg_turnover': stats['turnover'].resample('ME').sum().mean()
+        'avg_turnover': np.add.reduceat(stats['turnover'].to_numpy(), month_starts).mean()
     })
 
     print(f'  Return: {metrics["total_return"]:.1%} | Sharpe: {metrics["sharpe_ratio"]:.2f} | Max DD: {metrics["max_drawdown"]:.1%}')
@@ -108,15 +262,20 @@ metrics_to_optimize = {
     'Min Drawdown': 'max_drawdown'
 }
 
+# Plain arrays for the best-of lookups in this report
+lookbacks = summary_df.index.to_numpy()
+summary_values = {col: summary_df[col].to_numpy() for col in summary_df.columns}
+
 for metric_name, metric_col in metrics_to_optimize.items():
+    values = summary_values[metric_col]
     if metric_col == 'max_drawdown':
         # For drawdown, smaller absolute value is better
-        optimal_idx = summary_df[metric_col].abs().idxmin()
-        optimal_val = summary_df.loc[optimal_idx, metric_col]
+        best_pos = np.abs(values).argmin()
+        optimal_idx, optimal_val = lookbacks[best_pos], values[best_pos]
         print(f'{metric_name:.<25} {optimal_idx} days ({period_labels[optimal_idx]}): {optimal_val:.2%}')
     else:
-        optimal_idx = summary_df[metric_col].idxmax()
-        optimal_val = summary_df.loc[optimal_idx, metric_col]
+        best_pos = values.argmax()
+        optimal_idx, optimal_val = lookbacks[best_pos], values[best_pos]
         if 'ratio' in metric_col.lower():
             print(f'{metric_name:.<25} {optimal_idx} days ({period_labels[optimal_idx]}): {optimal_val:.2f}')
         else:
@@ -128,177 +287,8 @@ summary_df.to_csv(output_dir / 'sma_optimization_results.csv')
 print(f'\nSaved results to {output_dir / "sma_optimization_results.csv"}')
 
 # Create comprehensive visualization
-fig = plt.figure(figsize=(18, 12))
-gs = fig.add_gridspec(3, 3, hspace=0.35, wspace=0.3)
-
-# Color map for different lookbacks
-colors = plt.cm.viridis(np.linspace(0, 1, len(lookback_periods)))
-
-# 1. Cumulative returns comparison (large, spans 2 columns)
-ax1 = fig.add_subplot(gs[0, :2])
-for i, lookback in enumerate(lookback_periods):
-    cum_returns = (1 + results[lookback]['portfolio_stats']['returns']).cumprod()
-    label = f'{lookback}d ({period_labels[lookback]})'
-    linewidth = 2.5 if lookback == 252 else 1.5
-    alpha = 1.0 if lookback == 252 else 0.7
-    ax1.plot(cum_returns.index, cum_returns, label=label,
-             linewidth=linewidth, color=colors[i], alpha=alpha)
-
-ax1.set_title('Cumulative Returns: All Lookback Periods', fontsize=14, fontweight='bold')
-ax1.set_ylabel('Cumulative Return (Initial = 1.0)', fontsize=11)
-ax1.legend(loc='upper left', fontsize=9)
-ax1.grid(True, alpha=0.3)
-ax1.axhline(y=1.0, color='black', linestyle='-', linewidth=0.5)
-
-# Highlight baseline (252 days)
-textstr = f'Baseline (252d): {results[252]["performance_metrics"]["total_return"]:.1%}'
-ax1.text(0.02, 0.98, textstr, transform=ax1.transAxes, fontsize=10,
-        verticalalignment='top', bbox=dict(boxstyle='round', facecolor='yellow', alpha=0.7))
-
-# 2. Sharpe ratio by lookback
-ax2 = fig.add_subplot(gs[0, 2])
-sharpes = summary_df['sharpe_ratio']
-bars = ax2.bar(range(len(sharpes)), sharpes.values, color=colors, alpha=0.8, edgecolor='black')
-# Highlight best
-best_idx = sharpes.idxmax()
-best_pos = lookback_periods.index(best_idx)
-bars[best_pos].set_color('gold')
-bars[best_pos].set_edgecolor('red')
-bars[best_pos].set_linewidth(2)
-
-ax2.set_xticks(range(len(lookback_periods)))
-ax2.set_xticklabels([period_labels[p] for p in lookback_periods], fontsize=9)
-ax2.set_title('Sharpe Ratio by Lookback', fontsize=12, fontweight='bold')
-ax2.set_ylabel('Sharpe Ratio', fontsize=10)
-ax2.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
-ax2.grid(True, alpha=0.3, axis='y')
-
-# Add values on bars
-for i, (bar, val) in enumerate(zip(bars, sharpes.values)):
-    height = bar.get_height()
-    ax2.text(bar.get_x() + bar.get_width()/2., height,
-            f'{val:.2f}', ha='center', va='bottom', fontsize=8)
-
-# 3. Max drawdown by lookback
-ax3 = fig.add_subplot(gs[1, 0])
-drawdowns = summary_df['max_drawdown'].abs() * 100
-bars = ax3.bar(range(len(drawdowns)), drawdowns.values, color=colors, alpha=0.8, edgecolor='black')
-# Highlight best (lowest)
-best_idx = summary_df['max_drawdown'].abs().idxmin()
-best_pos = lookback_periods.index(best_idx)
-bars[best_pos].set_color('lightgreen')
-bars[best_pos].set_edgecolor('darkgreen')
-bars[best_pos].set_linewidth(2)
-
-ax3.set_xticks(range(len(lookback_periods)))
-ax3.set_xticklabels([period_labels[p] for p in lookback_periods], fontsize=9)
-ax3.set_title('Max Drawdown by Lookback', fontsize=12, fontweight='bold')
-ax3.set_ylabel('Max Drawdown (%)', fontsize=10)
-ax3.grid(True, alpha=0.3, axis='y')
-
-for i, (bar, val) in enumerate(zip(bars, drawdowns.values)):
-    height = bar.get_height()
-    ax3.text(bar.get_x() + bar.get_width()/2., height,
-            f'{val:.1f}%', ha='center', va='bottom', fontsize=8)
-
-# 4. Annualized return by lookback
-ax4 = fig.add_subplot(gs[1, 1])
-ann_returns = summary_df['annualized_return'] * 100
-bars = ax4.bar(range(len(ann_returns)), ann_returns.values, color=colors, alpha=0.8, edgecolor='black')
-best_idx = ann_returns.idxmax()
-best_pos = lookback_periods.index(best_idx)
-bars[best_pos].set_color('gold')
-bars[best_pos].set_edgecolor('red')
-bars[best_pos].set_linewidth(2)
-
-ax4.set_xticks(range(len(lookback_periods)))
-ax4.set_xticklabels([period_labels[p] for p in lookback_periods], fontsize=9)
-ax4.set_title('Annualized Return by Lookback', fontsize=12, fontweight='bold')
-ax4.set_ylabel('Annualized Return (%)', fontsize=10)
-ax4.grid(True, alpha=0.3, axis='y')
-
-for i, (bar, val) in enumerate(zip(bars, ann_returns.values)):
-    height = bar.get_height()
-    ax4.text(bar.get_x() + bar.get_width()/2., height,
-            f'{val:.1f}%', ha='center', va='bottom', fontsize=8)
-
-# 5. Calmar ratio by lookback
-ax5 = fig.add_subplot(gs[1, 2])
-calmars = summary_df['calmar_ratio']
-bars = ax5.bar(range(len(calmars)), calmars.values, color=colors, alpha=0.8, edgecolor='black')
-best_idx = calmars.idxmax()
-best_pos = lookback_periods.index(best_idx)
-bars[best_pos].set_color('gold')
-bars[best_pos].set_edgecolor('red')
-bars[best_pos].set_linewidth(2)
-
-ax5.set_xticks(range(len(lookback_periods)))
-ax5.set_xticklabels([period_labels[p] for p in lookback_periods], fontsize=9)
-ax5.set_title('Calmar Ratio by Lookback', fontsize=12, fontweight='bold')
-ax5.set_ylabel('Calmar Ratio', fontsize=10)
-ax5.grid(True, alpha=0.3, axis='y')
-
-for i, (bar, val) in enumerate(zip(bars, calmars.values)):
-    height = bar.get_height()
-    ax5.text(bar.get_x() + bar.get_width()/2., height,
-            f'{val:.2f}', ha='center', va='bottom', fontsize=8)
-
-# 6. Return vs Risk scatter
-ax6 = fig.add_subplot(gs[2, 0])
-for i, lookback in enumerate(lookback_periods):
-    ret = summary_df.loc[lookback, 'annualized_return'] * 100
-    vol = summary_df.loc[lookback, 'volatility'] * 100
-    label = period_labels[lookback]
-    size = 200 if lookback == 252 else 100
-    ax6.scatter(vol, ret, s=size, color=colors[i], alpha=0.8, edgecolors='black', linewidths=1.5)
-    ax6.annotate(label, (vol, ret), fontsize=8, ha='center', va='bottom')
-
-ax6.set_xlabel('Volatility (%)', fontsize=10)
-ax6.set_ylabel('Annualized Return (%)', fontsize=10)
-ax6.set_title('Return vs Risk', fontsize=12, fontweight='bold')
-ax6.grid(True, alpha=0.3)
-
-# 7. Average positions by lookback
-ax7 = fig.add_subplot(gs[2, 1])
-avg_pos = summary_df['avg_positions']
-ax7.bar(range(len(avg_pos)), avg_pos.values, color=colors, alpha=0.8, edgecolor='black')
-ax7.set_xticks(range(len(lookback_periods)))
-ax7.set_xticklabels([period_labels[p] for p in lookback_periods], fontsize=9)
-ax7.set_title('Average Positions Held', fontsize=12, fontweight='bold')
-ax7.set_ylabel('Number of Positions', fontsize=10)
-ax7.set_ylim([0, 5.5])
-ax7.grid(True, alpha=0.3, axis='y')
-
-# 8. Metric sensitivity heatmap
-ax8 = fig.add_subplot(gs[2, 2])
-# Normalize metrics to 0-100 scale for comparison
-norm_metrics = pd.DataFrame({
-    'Return': (summary_df['annualized_return'] - summary_df['annualized_return'].min()) / (summary_df['annualized_return'].max() - summary_df['annualized_return'].min()) * 100,
-    'Sharpe': (summary_df['sharpe_ratio'] - summary_df['sharpe_ratio'].min()) / (summary_df['sharpe_ratio'].max() - summary_df['sharpe_ratio'].min()) * 100,
-    'DD Control': (summary_df['max_drawdown'].abs().max() - summary_df['max_drawdown'].abs()) / (summary_df['max_drawdown'].abs().max() - summary_df['max_drawdown'].abs().min()) * 100,
-    'Calmar': (summary_df['calmar_ratio'] - summary_df['calmar_ratio'].min()) / (summary_df['calmar_ratio'].max() - summary_df['calmar_ratio'].min()) * 100
-})
-
-im = ax8.imshow(norm_metrics.T.values, cmap='RdYlGn', aspect='auto', vmin=0, vmax=100)
-ax8.set_xticks(range(len(lookback_periods)))
-ax8.set_xticklabels([period_labels[p] for p in lookback_periods], fontsize=9)
-ax8.set_yticks(range(len(norm_metrics.columns)))
-ax8.set_yticklabels(norm_metrics.columns, fontsize=9)
-ax8.set_title('Performance Heatmap\n(0=worst, 100=best)', fontsize=11, fontweight='bold')
-
-# Add text annotations
-for i in range(len(lookback_periods)):
-    for j in range(len(norm_metrics.columns)):
-        text = ax8.text(i, j, f'{norm_metrics.iloc[i, j]:.0f}',
-                       ha="center", va="center", color="black", fontsize=8)
-
-plt.colorbar(im, ax=ax8, fraction=0.046, pad=0.04)
-
-fig.suptitle('SMA Lookback Period Optimization (63 to 378 days)',
-             fontsize=16, fontweight='bold', y=0.998)
-
-plt.savefig(output_dir / 'sma_optimization.png', dpi=300, bbox_inches='tight')
-print(f'Saved visualization to {output_dir / "sma_optimization.png"}')
+if '--no-plot' not in sys.argv[1:]:
+    make_plots(prices, results, summary_df, lookback_periods, period_labels, output_dir)
 
 # Robustness analysis
 print('\n' + '=' * 80)
@@ -313,7 +303,7 @@ print(f'\nSharpe Ratio Statistics:')
 print(f'  Mean: {sharpe_mean:.3f}')
 print(f'  Std Dev: {sharpe_std:.3f}')
 print(f'  Coefficient of Variation: {sharpe_cv:.1%}')
-print(f'  Range: {summary_df["sharpe_ratio"].min():.3f} to {summary_df["sharpe_ratio"].max():.3f}')
+print(f'  Range: {summary_values["sharpe_ratio"].min():.3f} to {summary_values["sharpe_ratio"].max():.3f}')
 
 if sharpe_cv < 0.10:
     print('\n  ✓ Low sensitivity: Results robust across lookback periods')
@@ -327,9 +317,9 @@ print('\n' + '=' * 80)
 print('RECOMMENDATION')
 print('=' * 80)
 
-best_sharpe_period = summary_df['sharpe_ratio'].idxmax()
-best_calmar_period = summary_df['calmar_ratio'].idxmax()
-best_dd_period = summary_df['max_drawdown'].abs().idxmin()
+best_sharpe_period = lookbacks[summary_values['sharpe_ratio'].argmax()]
+best_calmar_period = lookbacks[summary_values['calmar_ratio'].argmax()]
+best_dd_period = lookbacks[np.abs(summary_values['max_drawdown']).argmin()]
 
 print(f'\nBest by Sharpe: {best_sharpe_period} days ({period_labels[best_sharpe_period]})')
 print(f'Best by Calmar: {best_calmar_period} days ({period_labels[best_calmar_period]})')
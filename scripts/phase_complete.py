@@ -11,14 +11,18 @@ Usage:
     python scripts/phase_complete.py --dry-run    # Preview without running
 """
 
+import re
 import subprocess
 import sys
 import os
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
+PHASE_RE = re.compile(r'phase\s*(\d+)', re.IGNORECASE)
+
 # ANSI colors
 CYAN = "\033[96m"
 RED = "\033[91m"
@@ -37,18 +41,22 @@ def run_cmd(cmd: str, cwd: str = None) -> str:
     return result.stdout.strip()
 
 
+@lru_cache(maxsize=1)
+def last_commit_subject() -> str:
+    """Subject line of HEAD, read from git once per run."""
+    return run_cmd("git log -1 --format=%s")
+
+
 def detect_phase_from_commit() -> str:
     """Detect phase number from the most recent commit message."""
-    msg = run_cmd("git log -1 --format=%s")
-    msg_lower = msg.lower()
+    msg = last_commit_subject()
 
     # Try to extract phase number
-    import re
-    match = re.search(r'phase\s*(\d+)', msg_lower)
+    match = PHASE_RE.search(msg)
     if match:
         return match.group(1)
 
-    if "phase" in msg_lower:
+    if "phase" in msg.lower():
         return "?"
 
     return None
@@ -56,7 +64,7 @@ def detect_phase_from_commit() -> str:
 
 def get_phase_summary() -> str:
     """Get a short summary of what this phase commit contains."""
-    msg = run_cmd("git log -1 --format=%s")
+    msg = last_commit_subject()
     files = run_cmd("git diff --name-only HEAD~1 HEAD")
     file_list = [f for f in files.split("\n") if f]
     py_files = [f for f in file_list if f.endswith(".py")]
@@ -71,8 +79,19 @@ def get_phase_summary() -> str:
     }
 
 
-def run_john(dry_run: bool = False) -> dict:
-    """Run John's code review."""
+def start_script(name: str, *args, capture: bool = True) -> subprocess.Popen:
+    """Launch scripts/<name> in the background; its output is kept for later."""
+    return subprocess.Popen(
+        [sys.executable, str(PROJECT_ROOT / "scripts" / name), *args],
+        cwd=str(PROJECT_ROOT),
+        stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+        stderr=subprocess.STDOUT if capture else subprocess.DEVNULL,
+        text=True,
+    )
+
+
+def run_john(dry_run: bool = False, proc: subprocess.Popen = None) -> dict:
+    """Run John's code review (or collect the run started by the caller)."""
     print(f"\n{RED}{BOLD}{'='*60}")
     print(f"  Waking up John for code review...")
     print(f"{'='*60}{RESET}\n")
@@ -81,17 +100,15 @@ def run_john(dry_run: bool = False) -> dict:
         print(f"  {YELLOW}[DRY RUN] Would run: python scripts/john_review.py --branch{RESET}")
         return {"ran": False, "exit_code": 0}
 
-    result = subprocess.run(
-        [sys.executable, str(PROJECT_ROOT / "scripts" / "john_review.py"), "--branch"],
-        cwd=str(PROJECT_ROOT),
-        capture_output=False,
-    )
+    proc = proc or start_script("john_review.py", "--branch")
+    print(proc.communicate()[0], end="")
 
-    return {"ran": True, "exit_code": result.returncode}
+    return {"ran": True, "exit_code": proc.returncode}
 
 
-def run_alex(dry_run: bool = False) -> dict:
-    """Run Alex's management report."""
+def run_alex(dry_run: bool = False, proc: subprocess.Popen = None,
+             report_proc: subprocess.Popen = None) -> dict:
+    """Run Alex's management report (or collect the runs started by the caller)."""
     print(f"\n{CYAN}{BOLD}{'='*60}")
     print(f"  Waking up Alex for management report...")
     print(f"{'='*60}{RESET}\n")
@@ -100,26 +117,28 @@ def run_alex(dry_run: bool = False) -> dict:
         print(f"  {YELLOW}[DRY RUN] Would run: python scripts/alex_report.py --summary{RESET}")
         return {"ran": False, "exit_code": 0}
 
-    result = subprocess.run(
-        [sys.executable, str(PROJECT_ROOT / "scripts" / "alex_report.py"), "--summary"],
-        cwd=str(PROJECT_ROOT),
-        capture_output=False,
-    )
+    proc = proc or start_script("alex_report.py", "--summary")
+    report_proc = report_proc or start_alex_full_report()
+    print(proc.communicate()[0], end="")
 
     # Also generate full report and save it
-    timestamp = datetime.now().strftime("%Y%m%d")
-    report_path = PROJECT_ROOT / "outputs" / f"phase_report_{timestamp}.md"
-    subprocess.run(
-        [sys.executable, str(PROJECT_ROOT / "scripts" / "alex_report.py"),
-         "--output", str(report_path)],
-        cwd=str(PROJECT_ROOT),
-        capture_output=True,
-    )
-
+    report_proc.wait()
+    report_path = phase_report_path()
     if report_path.exists():
         print(f"\n  Full report saved to: {report_path}")
 
-    return {"ran": True, "exit_code": result.returncode}
+    return {"ran": True, "exit_code": proc.returncode}
+
+
+def phase_report_path() -> Path:
+    """Where today's full Alex report is written."""
+    timestamp = datetime.now().strftime("%Y%m%d")
+    return PROJECT_ROOT / "outputs" / f"phase_report_{timestamp}.md"
+
+
+def start_alex_full_report() -> subprocess.Popen:
+    """Start writing Alex's full report to outputs/phase_report_<date>.md."""
+    return start_script("alex_report.py", "--output", str(phase_report_path()), capture=False)
 
 
 def main():
@@ -146,11 +165,19 @@ def main():
     print(f"  Files:  {summary['total_files']} changed ({summary['py_files']} .py, {summary['test_files']} tests)")
     print(f"  Time:   {datetime.now().strftime('%Y-%m-%d %H:%M')}")
 
+    # John and Alex are independent: start both (and Alex's full report)
+    # together, then print their output one after the other
+    procs = {}
+    if not dry_run:
+        procs["john"] = start_script("john_review.py", "--branch")
+        procs["alex"] = start_script("alex_report.py", "--summary")
+        procs["report"] = start_alex_full_report()
+
     # Run John
-    john_result = run_john(dry_run)
+    john_result = run_john(dry_run, procs.get("john"))
 
     # Run Alex
-    alex_result = run_alex(dry_run)
+    alex_result = run_alex(dry_run, procs.get("alex"), procs.get("report"))
 
     # Summary
     print(f"\n{BOLD}{'='*60}")
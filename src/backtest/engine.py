@@ -11,7 +11,7 @@ Simple event-driven backtester that:
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 
 def calculate_strategy_returns(
@@ -50,104 +50,120 @@ def calculate_strategy_returns(
         - positions: Number of positions held
         - turnover: Portfolio turnover (fraction changed)
     """
-    # Calculate daily returns
-    daily_returns = prices.pct_change()
+    return calculate_strategy_returns_batch(
+        prices,
+        [signals],
+        initial_capital=initial_capital,
+        transaction_cost=transaction_cost,
+        rebalance_frequency=rebalance_frequency
+    )[0]
 
-    # Align signals with returns (shift signals to avoid lookahead bias)
-    # Signal on day t should be executed at close of day t,
-    # earning returns from t to t+1
-    signals_shifted = signals.shift(1).fillna(0)
 
-    # Rebalance dates
+def _rebalance_mask(index: pd.DatetimeIndex, rebalance_frequency: str) -> np.ndarray:
+    """Boolean array marking the rebalance dates within index."""
     if rebalance_frequency == 'M':
-        rebalance_dates = pd.date_range(
-            start=prices.index[0],
-            end=prices.index[-1],
-            freq='MS'  # Month start
-        )
+        rebalance_dates = pd.date_range(start=index[0], end=index[-1], freq='MS')  # Month start
     elif rebalance_frequency == 'W':
-        rebalance_dates = pd.date_range(
-            start=prices.index[0],
-            end=prices.index[-1],
-            freq='W'
-        )
+        rebalance_dates = pd.date_range(start=index[0], end=index[-1], freq='W')
     else:  # Daily
-        rebalance_dates = prices.index
+        return np.ones(len(index), dtype=bool)
+    return index.isin(rebalance_dates)
+
+
+def calculate_strategy_returns_batch(
+    prices: pd.DataFrame,
+    signals: List[pd.DataFrame],
+    initial_capital: float = 100.0,
+    transaction_cost: Union[float, Sequence[float]] = 0.0005,
+    rebalance_frequency: str = 'M'
+) -> List[pd.DataFrame]:
+    """
+    Backtest several signal sets on the same prices in one pass.
+
+    Equivalent to calling calculate_strategy_returns once per signal
+    frame (equal weight sizing), but the daily loop runs once over the
+    prices, updating the weights of all strategies as one
+    (n_strategies, n_assets) array.
+
+    Parameters
+    ----------
+    prices : pd.DataFrame
+        Daily asset prices (DatetimeIndex, columns = tickers).
+    signals : list of pd.DataFrame
+        One signal frame (0 or 1) per strategy, each shaped like prices.
+    initial_capital : float, default 100.0
+        Starting portfolio value.
+    transaction_cost : float or sequence of float, default 0.0005
+        Transaction cost as fraction of trade value, either shared or one
+        per strategy.
+    rebalance_frequency : str, default 'M'
+        Rebalancing frequency: 'D' (daily), 'W' (weekly), 'M' (monthly).
 
-    # Initialize portfolio
-    portfolio_value = pd.Series(index=prices.index, dtype=float)
-    portfolio_value.iloc[0] = initial_capital
+    Returns
+    -------
+    list of pd.DataFrame
+        One frame per strategy, in input order, with the same columns as
+        calculate_strategy_returns.
+    """
+    # Calculate daily returns
+    daily_returns = prices.pct_change().to_numpy()
 
-    # Track positions (weights)
-    weights = pd.DataFrame(0.0, index=prices.index, columns=prices.columns)
-    turnover = pd.Series(0.0, index=prices.index)
+    # Align signals with returns (shift signals to avoid lookahead bias)
+    # Signal on day t should be executed at close of day t,
+    # earning returns from t to t+1. Signals are matched to prices by
+    # label before stacking, so column or row order does not matter.
+    signals_shifted = [
+        s.reindex(index=prices.index, columns=prices.columns).shift(1).fillna(0)
+        for s in signals
+    ]
+    active = np.stack([s.to_numpy(dtype=float) for s in signals_shifted], axis=1)  # (T, S, N)
+
+    n_days, n_strategies = active.shape[:2]
+    costs = np.broadcast_to(np.asarray(transaction_cost, dtype=float), (n_strategies,))
+    is_rebalance = _rebalance_mask(prices.index, rebalance_frequency)
+
+    portfolio_value = np.full((n_days, n_strategies), np.nan)
+    portfolio_value[0] = initial_capital
+    turnover = np.zeros((n_days, n_strategies))
 
     # Previous weights for turnover calculation
-    prev_weights = pd.Series(0.0, index=prices.columns)
-
-    for i in range(1, len(prices)):
-        date = prices.index[i]
-        prev_date = prices.index[i-1]
-
-        # Check if rebalance date
-        is_rebalance = date in rebalance_dates
-
-        if is_rebalance or i == 1:
-            # Get active signals (1 = long)
-            active_signals = signals_shifted.loc[date]
-            n_positions = active_signals.sum()
-
-            if n_positions > 0:
-                if position_size == 'equal_weight':
-                    # Equal weight across active positions
-                    target_weights = active_signals / n_positions
-                else:
-                    # For now, default to equal weight
-                    target_weights = active_signals / n_positions
-            else:
-                # No positions, hold cash
-                target_weights = pd.Series(0.0, index=prices.columns)
-
-            # Calculate turnover (sum of absolute weight changes)
-            turnover.iloc[i] = (target_weights - prev_weights).abs().sum()
-
-            # Apply transaction costs
-            tc_cost = turnover.iloc[i] * transaction_cost
-            portfolio_value.iloc[i] = portfolio_value.iloc[i-1] * (1 - tc_cost)
-
-            # Update weights
-            weights.loc[date] = target_weights
+    prev_weights = np.zeros(active.shape[1:])
+
+    for i in range(1, n_days):
+        if is_rebalance[i] or i == 1:
+            # Equal weight across active positions, cash if none
+            n_positions = active[i].sum(axis=1, keepdims=True)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                target_weights = np.where(n_positions > 0, active[i] / n_positions, 0.0)
+
+            # Turnover (sum of absolute weight changes) and its cost
+            turnover[i] = np.abs(target_weights - prev_weights).sum(axis=1)
+            portfolio_value[i] = portfolio_value[i-1] * (1 - turnover[i] * costs)
+
+            weights = target_weights
             prev_weights = target_weights
         else:
-            # No rebalance, weights drift with returns
-            # Calculate new portfolio value from returns
-            portfolio_value.iloc[i] = portfolio_value.iloc[i-1]
-            weights.loc[date] = prev_weights
+            portfolio_value[i] = portfolio_value[i-1]
+            weights = prev_weights
 
-        # Apply returns based on weights
-        period_return = (weights.loc[date] * daily_returns.loc[date]).sum()
-        portfolio_value.iloc[i] = portfolio_value.iloc[i] * (1 + period_return)
+        # Apply returns based on weights (missing asset returns count as 0)
+        period_return = np.nansum(weights * daily_returns[i], axis=1)
+        portfolio_value[i] = portfolio_value[i] * (1 + period_return)
 
-        # Update drifted weights for next iteration
-        if not is_rebalance:
+        if not is_rebalance[i]:
             # Weights drift: w_new = w_old * (1 + r) / (1 + r_portfolio)
-            individual_returns = daily_returns.loc[date]
-            prev_weights = prev_weights * (1 + individual_returns) / (1 + period_return)
-            prev_weights = prev_weights.fillna(0)
-
-    # Calculate portfolio returns
-    portfolio_returns = portfolio_value.pct_change().fillna(0)
+            prev_weights = prev_weights * (1 + daily_returns[i]) / (1 + period_return)[:, None]
+            prev_weights = np.where(np.isnan(prev_weights), 0.0, prev_weights)
 
-    # Number of positions held
-    positions = signals_shifted.sum(axis=1)
-
-    # Combine results
-    results = pd.DataFrame({
-        'portfolio_value': portfolio_value,
-        'returns': portfolio_returns,
-        'positions': positions,
-        'turnover': turnover
-    })
+    results = []
+    for j, shifted in enumerate(signals_shifted):
+        value = pd.Series(portfolio_value[:, j], index=prices.index)
+        results.append(pd.DataFrame({
+            'portfolio_value': value,
+            'returns': value.pct_change().fillna(0),
+            'positions': shifted.sum(axis=1),
+            'turnover': pd.Series(turnover[:, j], index=prices.index)
+        }))
 
     return results
 
@@ -176,36 +192,37 @@ def calculate_performance_metrics(returns: pd.Series) -> Dict[str, float]:
         - avg_win: Average winning day return
         - avg_loss: Average losing day return
     """
+    values = returns.to_numpy(dtype=float)
+    valid = values[~np.isnan(values)]
+
+    # Equity curve and drawdown share one cumulative product
+    cumulative, drawdown = _equity_and_drawdown(values)
+
     # Total return
-    cumulative_returns = (1 + returns).cumprod()
-    total_return = cumulative_returns.iloc[-1] - 1
+    total_return = cumulative[-1] - 1
 
     # Annualized metrics (assuming 252 trading days)
-    n_years = len(returns) / 252
+    n_years = len(values) / 252
     annualized_return = (1 + total_return) ** (1 / n_years) - 1
-    annualized_volatility = returns.std() * np.sqrt(252)
+    annualized_volatility = _sample_std(values) * np.sqrt(252)
 
     # Sharpe ratio (risk-free rate = 0)
     sharpe_ratio = annualized_return / annualized_volatility if annualized_volatility > 0 else 0
 
     # Sortino ratio (downside deviation)
-    downside_returns = returns[returns < 0]
-    downside_std = downside_returns.std() * np.sqrt(252)
+    losing_days = valid[valid < 0]
+    downside_std = _sample_std(losing_days) * np.sqrt(252)
     sortino_ratio = annualized_return / downside_std if downside_std > 0 else 0
 
     # Maximum drawdown
-    cumulative = (1 + returns).cumprod()
-    running_max = cumulative.expanding().max()
-    drawdown = (cumulative - running_max) / running_max
-    max_drawdown = drawdown.min()
+    max_drawdown = np.nanmin(drawdown) if len(valid) > 0 else np.nan
 
     # Calmar ratio
     calmar_ratio = annualized_return / abs(max_drawdown) if max_drawdown < 0 else 0
 
     # Win/loss statistics
-    winning_days = returns[returns > 0]
-    losing_days = returns[returns < 0]
-    win_rate = len(winning_days) / len(returns) if len(returns) > 0 else 0
+    winning_days = valid[valid > 0]
+    win_rate = len(winning_days) / len(values) if len(values) > 0 else 0
     avg_win = winning_days.mean() if len(winning_days) > 0 else 0
     avg_loss = losing_days.mean() if len(losing_days) > 0 else 0
 
@@ -237,10 +254,43 @@ def calculate_drawdown_series(returns: pd.Series) -> pd.Series:
     pd.Series
         Drawdown series (negative values indicate drawdown from peak).
     """
-    cumulative = (1 + returns).cumprod()
-    running_max = cumulative.expanding().max()
-    drawdown = (cumulative - running_max) / running_max
-    return drawdown
+    _, drawdown = _equity_and_drawdown(returns.to_numpy(dtype=float))
+    return pd.Series(drawdown, index=returns.index, name=returns.name)
+
+
+def _equity_and_drawdown(returns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Cumulative growth of 1 and drawdown arrays, NaN where returns are NaN."""
+    growth = 1 + returns
+    missing = np.isnan(growth)
+
+    # NaN returns are skipped (the equity holds its level), as with
+    # pandas cumprod; cumprod + maximum.accumulate are single C sweeps
+    cumulative = np.cumprod(np.where(missing, 1.0, growth))
+    # Leading NaNs must not seed the peak with the 1.0 placeholder
+    running_max = np.maximum.accumulate(np.where(missing, -np.inf, cumulative))
+
+    with np.errstate(invalid='ignore'):
+        drawdown = (cumulative - running_max) / running_max
+    cumulative[missing] = np.nan
+    drawdown[missing] = np.nan
+    return cumulative, drawdown
+
+
+def _sample_std(values: np.ndarray) -> float:
+    """
+    Sample standard deviation (ddof=1) skipping NaN, NaN for fewer than
+    two values. Uses the same two-pass formula as pandas' Series.std,
+    with NaN slots zeroed in place, so results agree to the last bit.
+    """
+    missing = np.isnan(values)
+    n = len(values) - missing.sum()
+    if n < 2:
+        return np.nan
+    filled = np.where(missing, 0.0, values)
+    mean = filled.sum() / n
+    squares = (mean - filled) ** 2
+    squares[missing] = 0.0
+    return np.sqrt(squares.sum() / (n - 1))
 
 
 def backtest_strategy(
@@ -315,7 +365,8 @@ def classify_regimes(
     Returns
     -------
     pd.Series
-        Regime classification ('bull', 'bear', or 'sideways') for each date.
+        Regime classification ('bull', 'bear', or 'sideways') for each date,
+        as a categorical Series.
     """
     rolling_max = spy_prices.rolling(252).max()
     rolling_min = spy_prices.rolling(252).min()
@@ -323,11 +374,15 @@ def classify_regimes(
     drawdown_from_peak = (spy_prices - rolling_max) / rolling_max
     rally_from_trough = (spy_prices - rolling_min) / rolling_min
 
-    regime = pd.Series('sideways', index=spy_prices.index)
-    regime[rally_from_trough > bull_threshold] = 'bull'
-    regime[drawdown_from_peak < bear_threshold] = 'bear'
+    # Integer codes instead of object-dtype string writes; bear overrides
+    # bull, and NaN comparisons (warm-up window) fall through to sideways
+    codes = np.where(
+        drawdown_from_peak.to_numpy() < bear_threshold, 2,
+        np.where(rally_from_trough.to_numpy() > bull_threshold, 1, 0)
+    ).astype(np.int8)
+    regime = pd.Categorical.from_codes(codes, categories=['sideways', 'bull', 'bear'])
 
-    return regime
+    return pd.Series(regime, index=spy_prices.index)
 
 
 def performance_by_regime(returns: pd.Series, regimes: pd.Series) -> pd.DataFrame:
@@ -386,39 +441,39 @@ def extract_trade_log(signals: pd.DataFrame, prices: pd.DataFrame) -> pd.DataFra
         - return: Trade return (%)
         - days_held: Number of days held
     """
-    trades = []
+    dates = signals.index
+    # Prices looked up by label once, aligned to the signal grid
+    price_values = prices.loc[dates, signals.columns].to_numpy()
+    changes = signals.diff().to_numpy()
 
-    for asset in signals.columns:
-        asset_signals = signals[asset]
-        changes = asset_signals.diff()
-
-        # Entry: 0 → 1
-        entries = changes[changes == 1].index
-        # Exit: 1 → 0
-        exits = changes[changes == -1].index
-
-        # Match entries to exits
-        for entry_date in entries:
-            # Find next exit after this entry
-            exit_dates = exits[exits > entry_date]
-            if len(exit_dates) > 0:
-                exit_date = exit_dates[0]
-                entry_price = prices.loc[entry_date, asset]
-                exit_price = prices.loc[exit_date, asset]
-                ret = (exit_price - entry_price) / entry_price
-                days_held = (exit_date - entry_date).days
-
-                trades.append({
-                    'entry_date': entry_date,
-                    'exit_date': exit_date,
-                    'asset': asset,
-                    'entry_price': entry_price,
-                    'exit_price': exit_price,
-                    'return': ret,
-                    'days_held': days_held
-                })
-
-    return pd.DataFrame(trades)
+    trades = []
+    for j, asset in enumerate(signals.columns):
+        # Entry: 0 → 1, exit: 1 → 0 (row positions, in date order)
+        entries = np.flatnonzero(changes[:, j] == 1)
+        exits = np.flatnonzero(changes[:, j] == -1)
+
+        # Match each entry to the next exit after it; open trades are dropped
+        next_exit = np.searchsorted(exits, entries, side='right')
+        closed = next_exit < len(exits)
+        entries = entries[closed]
+        exits = exits[next_exit[closed]]
+
+        entry_price = price_values[entries, j]
+        exit_price = price_values[exits, j]
+        trades.append(pd.DataFrame({
+            'entry_date': dates[entries],
+            'exit_date': dates[exits],
+            'asset': asset,
+            'entry_price': entry_price,
+            'exit_price': exit_price,
+            'return': (exit_price - entry_price) / entry_price,
+            'days_held': (dates[exits] - dates[entries]).days
+        }))
+
+    trades = [t for t in trades if len(t) > 0]
+    if not trades:
+        return pd.DataFrame()
+    return pd.concat(trades, ignore_index=True)
 
 
 def calculate_var(returns: pd.Series, confidence: float = 0.95) -> float:
@@ -485,20 +540,56 @@ def calculate_rolling_var_cvar(returns: pd.Series, window: int = 252,
     """
     results = pd.DataFrame(index=returns.index)
 
+    values = returns.to_numpy(dtype=float)
+    n_windows = len(values) - window + 1
+    # One (n_windows, window) strided view replaces a Python call per window
+    if n_windows > 0:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)
+
     for conf in confidence_levels:
         conf_pct = int(conf * 100)
-        # Calculate rolling VaR
-        results[f'VaR_{conf_pct}%'] = returns.rolling(window).apply(
-            lambda x: calculate_var(x, conf), raw=False
-        )
-        # Calculate rolling CVaR
-        results[f'CVaR_{conf_pct}%'] = returns.rolling(window).apply(
-            lambda x: calculate_cvar(x, conf), raw=False
-        )
+        var = np.full(len(values), np.nan)
+        cvar = np.full(len(values), np.nan)
+
+        if n_windows > 0:
+            # Same interpolation as calculate_var, row by row; a window
+            # containing NaN gives NaN, like rolling(window) did
+            var[window - 1:] = np.percentile(windows, (1 - conf) * 100, axis=1)
+
+            # CVaR: mean of the returns at or below each window's VaR
+            tail = windows <= var[window - 1:, None]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                cvar[window - 1:] = np.where(tail, windows, 0.0).sum(axis=1) / tail.sum(axis=1)
+
+        results[f'VaR_{conf_pct}%'] = var
+        results[f'CVaR_{conf_pct}%'] = cvar
 
     return results
 
 
+def calculate_rolling_sharpe(returns: Union[pd.Series, pd.DataFrame],
+                             window: int = 252) -> Union[pd.Series, pd.DataFrame]:
+    """
+    Annualized trailing-window Sharpe ratio (risk-free rate = 0).
+
+    Parameters
+    ----------
+    returns : pd.Series or pd.DataFrame
+        Daily returns; a DataFrame is handled one column per strategy in
+        a single rolling pass.
+    window : int, default 252
+        Rolling window size in days.
+
+    Returns
+    -------
+    pd.Series or pd.DataFrame
+        Rolling Sharpe, same shape as returns. NaN during the first
+        window-1 days and wherever pandas' rolling mean / std is undefined.
+    """
+    rolling = returns.rolling(window)
+    return rolling.mean() / rolling.std() * np.sqrt(252)
+
+
 if __name__ == "__main__":
     # Example usage
     from pathlib import Path
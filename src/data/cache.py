@@ -0,0 +1,78 @@
+# src/data/cache.py
+import hashlib
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+"""
+On-disk memoization for the research scripts, under outputs/.cache (git-ignored).
+
+Every key is salted with CACHE_VERSION and a fingerprint of the src/ code,
+so entries written by an older engine, signal generator or payload format
+are never read back.
+"""
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CACHE_DIR = PROJECT_ROOT / "outputs" / ".cache"
+SRC_DIR = PROJECT_ROOT / "src"
+
+# Bump when the shape of a cached payload changes without a src/ change
+# (e.g. a script starts storing a tuple where it stored a dict)
+CACHE_VERSION = 2
+
+
+@lru_cache(maxsize=1)
+def source_fingerprint() -> str:
+    """Hash of every src/**/*.py file (path and content) plus the pandas version."""
+    digest = hashlib.blake2b(pd.__version__.encode(), digest_size=16)
+    for path in sorted(SRC_DIR.rglob("*.py")):
+        digest.update(str(path.relative_to(SRC_DIR)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def cached(key, fn, *args, **kwargs):
+    """
+    Return fn(*args, **kwargs), memoized on disk under outputs/.cache.
+
+    The key must capture everything the result depends on besides the
+    code (data file, parameters) and start with a name unique to the
+    payload, e.g. ('sma_sweep', data_key, params). It is hashed with
+    blake2b together with CACHE_VERSION and source_fingerprint(), and
+    the result is pickled to <hash>.pkl.
+    """
+    salted = (CACHE_VERSION, source_fingerprint(), key)
+    digest = hashlib.blake2b(repr(salted).encode(), digest_size=16).hexdigest()
+    cache_path = CACHE_DIR / f"{digest}.pkl"
+
+    if cache_path.exists():
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+
+    result = fn(*args, **kwargs)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Write then rename, so an interrupted run never leaves a partial pickle
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+    return result
+
+
+def file_key(path: Path) -> tuple:
+    """Identity of a data file for cache keys: path, mtime and size."""
+    stat = path.stat()
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def load_prices(data_path: Path) -> pd.DataFrame:
+    """
+    Load a price CSV (Date index), parsing it only when the file changes.
+
+    The parsed frame is cached under ('prices_csv', file_key(data_path)).
+    """
+    return cached(("prices_csv", file_key(data_path)), pd.read_csv, data_path,
+                  index_col=0, parse_dates=True)
@@ -3,7 +3,9 @@
 import yfinance as yf
 import pandas as pd
 from pathlib import Path
-from typing import List, Union
+from typing import Callable, Dict, List, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 import time
 import pandas_datareader as pdr
 
@@ -14,6 +16,72 @@ And store them in the raw folder
 
 DATA_DIR = Path(__file__).resolve().parents[2] / "data" / "raw"
 
+# Downloads run concurrently; request starts stay spaced by the per-source
+# delay so the request rate is unchanged, only the waiting overlaps
+MAX_WORKERS = 4
+
+
+class _RequestPacer:
+    """Space request start times at least `interval` seconds apart across threads."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        time.sleep(start - now)
+
+
+def _download_all(
+    tickers: List[str],
+    fetch: Callable[[str], pd.DataFrame],
+    delay: float,
+) -> Tuple[Dict[str, pd.Series], List[str]]:
+    """
+    Fetch every ticker on a thread pool and keep the Close column.
+
+    Returns the Close series in ticker order and the tickers that failed.
+    """
+    pacer = _RequestPacer(delay)
+
+    def download_one(ticker: str) -> pd.DataFrame:
+        pacer.wait()
+        return fetch(ticker)
+
+    closes = {}
+    failed_tickers = []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(download_one, ticker): ticker for ticker in tickers}
+        for done, future in enumerate(as_completed(futures), start=1):
+            ticker = futures[future]
+            prefix = f"{ticker} ({done}/{len(tickers)})"
+            try:
+                data = future.result()
+            except Exception as e:
+                print(f"  Error downloading {prefix}: {e}")
+                failed_tickers.append(ticker)
+                continue
+
+            if data.empty:
+                print(f"  Warning: No data returned for {prefix}")
+                failed_tickers.append(ticker)
+            elif 'Close' not in data.columns:
+                print(f"  Warning: No Close price for {prefix}")
+                failed_tickers.append(ticker)
+            else:
+                closes[ticker] = data['Close']
+                print(f"  Success: {prefix} {len(data)} rows downloaded")
+
+    # Completion order is arbitrary; keep the requested column order
+    ticker_dfs = {ticker: closes[ticker] for ticker in tickers if ticker in closes}
+    failed_tickers = [ticker for ticker in tickers if ticker in failed_tickers]
+    return ticker_dfs, failed_tickers
+
 
 def download_history(
     tickers: Union[str, List[str]],
@@ -48,40 +116,15 @@ def download_history(
     if isinstance(tickers, str):
         tickers = [tickers]
 
-    # Download tickers one at a time with delays to avoid rate limits
-    ticker_dfs = {}
-    failed_tickers = []
-
-    for i, ticker in enumerate(tickers):
-        try:
-            print(f"Downloading {ticker} ({i+1}/{len(tickers)})...")
+    print(f"Downloading {len(tickers)} tickers...")
 
-            # Use Ticker API instead of download() - different endpoint
-            ticker_obj = yf.Ticker(ticker)
-            data = ticker_obj.history(start=start, end=end, auto_adjust=auto_adjust)
-
-            if data.empty:
-                print(f"  Warning: No data returned for {ticker}")
-                failed_tickers.append(ticker)
-                continue
-
-            # Ticker.history() returns Close column (already adjusted if auto_adjust=True)
-            if 'Close' in data.columns:
-                ticker_dfs[ticker] = data['Close']
-            else:
-                print(f"  Warning: No price data for {ticker}")
-                failed_tickers.append(ticker)
-                continue
-
-            print(f"  Success: {len(data)} rows downloaded")
-
-            # Add delay between requests to avoid rate limiting (except for last ticker)
-            if i < len(tickers) - 1:
-                time.sleep(2)
-
-        except Exception as e:
-            print(f"  Error downloading {ticker}: {e}")
-            failed_tickers.append(ticker)
+    # Use Ticker API instead of download() - different endpoint.
+    # Ticker.history() returns Close column (already adjusted if auto_adjust=True)
+    ticker_dfs, failed_tickers = _download_all(
+        tickers,
+        lambda ticker: yf.Ticker(ticker).history(start=start, end=end, auto_adjust=auto_adjust),
+        delay=2
+    )
 
     if not ticker_dfs:
         raise ValueError("No data downloaded for any ticker!")
@@ -127,39 +170,15 @@ def download_history_stooq(
     if isinstance(tickers, str):
         tickers = [tickers]
 
-    ticker_dfs = {}
-    failed_tickers = []
-
-    for i, ticker in enumerate(tickers):
-        try:
-            print(f"Downloading {ticker} from Stooq ({i+1}/{len(tickers)})...")
-
-            # Stooq uses US ticker format
-            data = pdr.DataReader(ticker, 'stooq', start=start, end=end)
-
-            if data.empty:
-                print(f"  Warning: No data returned for {ticker}")
-                failed_tickers.append(ticker)
-                continue
-
-            # Stooq returns data in reverse chronological order, so sort it
-            data = data.sort_index()
-
-            if 'Close' in data.columns:
-                ticker_dfs[ticker] = data['Close']
-                print(f"  Success: {len(data)} rows downloaded")
-            else:
-                print(f"  Warning: No Close price for {ticker}")
-                failed_tickers.append(ticker)
-                continue
-
-            # Small delay between requests
-            if i < len(tickers) - 1:
-                time.sleep(1)
+    print(f"Downloading {len(tickers)} tickers from Stooq...")
 
-        except Exception as e:
-            print(f"  Error downloading {ticker}: {e}")
-            failed_tickers.append(ticker)
+    # Stooq uses US ticker format and returns data in reverse
+    # chronological order, so sort it
+    ticker_dfs, failed_tickers = _download_all(
+        tickers,
+        lambda ticker: pdr.DataReader(ticker, 'stooq', start=start, end=end).sort_index(),
+        delay=1
+    )
 
     if not ticker_dfs:
         raise ValueError("No data downloaded for any ticker!")
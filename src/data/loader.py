@@ -1,4 +1,5 @@
 # src/data/loader.py
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -40,15 +41,17 @@ def preprocess_prices(
     pd.DataFrame
         Cleaned price table.
     """
-    df = prices.copy()
-
     # at least has min_assets with prices，or delete this row
+    # (take() returns an owned copy, so the fills below can run in place)
     if drop_na:
-        mask = df.notna().sum(axis=1) >= min_assets
-        df = df[mask]
+        mask = prices.notna().sum(axis=1) >= min_assets
+        df = prices.take(np.flatnonzero(mask))
+    else:
+        df = prices.copy()
 
-    # forward fill first，then back fill ，fill the NA
-    df = df.ffill().bfill()
+    # forward fill first，then back fill ，fill the NA (in place, no extra copies)
+    df.ffill(inplace=True)
+    df.bfill(inplace=True)
 
     PROC_DIR.mkdir(parents=True, exist_ok=True)
     out_path = PROC_DIR / "prices_clean.csv"
@@ -61,15 +61,14 @@ def sma_trend_signal(prices: pd.DataFrame, window: int = 252) -> pd.DataFrame:
     pd.DataFrame
         DataFrame of signals (0 or 1), NaN where insufficient data.
     """
-    sma = calculate_sma(prices, window)
+    sma = calculate_sma(prices, window).to_numpy()
 
-    # Signal: 1 if price > SMA, 0 otherwise
-    signals = (prices > sma).astype(float)
+    # Signal: 1 if price > SMA, 0 otherwise; NaN where SMA is NaN
+    # (insufficient data). Computed on the raw arrays to skip the
+    # DataFrame boolean-mask assignment.
+    values = _masked_signal(prices.to_numpy() > sma, np.isnan(sma))
 
-    # Set to NaN where SMA is NaN (insufficient data)
-    signals[sma.isna()] = np.nan
-
-    return signals
+    return pd.DataFrame(values, index=prices.index, columns=prices.columns)
 
 
 def calculate_ema(prices: pd.DataFrame, span: int) -> pd.DataFrame:
@@ -115,9 +114,9 @@ def ema_trend_signal(prices: pd.DataFrame, span: int = 252) -> pd.DataFrame:
     ema = calculate_ema(prices, span)
 
     # Signal: 1 if price > EMA, 0 otherwise
-    signals = (prices > ema).astype(float)
+    values = (prices.to_numpy() > ema.to_numpy()).astype(float)
 
-    return signals
+    return pd.DataFrame(values, index=prices.index, columns=prices.columns)
 
 
 def calculate_momentum(prices: pd.DataFrame, lookback: int) -> pd.DataFrame:
@@ -142,6 +141,24 @@ def calculate_momentum(prices: pd.DataFrame, lookback: int) -> pd.DataFrame:
     return prices.pct_change(periods=lookback)
 
 
+def _masked_signal(condition: np.ndarray, invalid: np.ndarray) -> np.ndarray:
+    """Convert a boolean condition array to 0/1 floats, NaN where invalid."""
+    return np.where(invalid, np.nan, condition.astype(float))
+
+
+def _absolute_momentum_values(momentum: pd.DataFrame, threshold: float) -> np.ndarray:
+    """Absolute momentum signal array from a precomputed momentum frame."""
+    mom = momentum.to_numpy()
+    return _masked_signal(mom > threshold, np.isnan(mom))
+
+
+def _relative_momentum_values(momentum: pd.DataFrame, top_n: int) -> np.ndarray:
+    """Relative momentum signal array from a precomputed momentum frame."""
+    # rank(ascending=False) gives 1 to highest, 2 to second, etc.
+    ranks = momentum.rank(axis=1, ascending=False).to_numpy()
+    return _masked_signal(ranks <= top_n, np.isnan(momentum.to_numpy()))
+
+
 def absolute_momentum_signal(
     prices: pd.DataFrame,
     lookback: int = 252,
@@ -170,13 +187,10 @@ def absolute_momentum_signal(
     """
     momentum = calculate_momentum(prices, lookback)
 
-    # Signal: 1 if momentum > threshold, 0 otherwise
-    signals = (momentum > threshold).astype(float)
-
-    # Set to NaN where momentum is NaN
-    signals[momentum.isna()] = np.nan
+    # Signal: 1 if momentum > threshold, 0 otherwise; NaN where momentum is NaN
+    values = _absolute_momentum_values(momentum, threshold)
 
-    return signals
+    return pd.DataFrame(values, index=prices.index, columns=prices.columns)
 
 
 def relative_momentum_signal(
@@ -206,17 +220,11 @@ def relative_momentum_signal(
     """
     momentum = calculate_momentum(prices, lookback)
 
-    # Rank assets by momentum (higher is better)
-    # rank(ascending=False) gives 1 to highest, 2 to second, etc.
-    ranks = momentum.rank(axis=1, ascending=False)
-
-    # Signal top N
-    signals = (ranks <= top_n).astype(float)
+    # Rank assets by momentum (higher is better) and signal top N;
+    # NaN where momentum is NaN
+    values = _relative_momentum_values(momentum, top_n)
 
-    # Set to NaN where momentum is NaN
-    signals[momentum.isna()] = np.nan
-
-    return signals
+    return pd.DataFrame(values, index=prices.index, columns=prices.columns)
 
 
 def dual_momentum_signal(
@@ -252,18 +260,18 @@ def dual_momentum_signal(
     pd.DataFrame
         DataFrame of signals (0 or 1), NaN where insufficient data.
     """
-    # Get both signals
-    abs_signals = absolute_momentum_signal(prices, lookback, abs_threshold)
-    rel_signals = relative_momentum_signal(prices, lookback, top_n)
-
-    # Dual momentum: both conditions must be true
-    dual_signals = (abs_signals == 1) & (rel_signals == 1)
-    dual_signals = dual_signals.astype(float)
+    # Both legs share one momentum calculation
+    momentum = calculate_momentum(prices, lookback)
+    abs_values = _absolute_momentum_values(momentum, abs_threshold)
+    rel_values = _relative_momentum_values(momentum, top_n)
 
-    # Set to NaN where either input is NaN
-    dual_signals[(abs_signals.isna()) | (rel_signals.isna())] = np.nan
+    # Dual momentum: both conditions must be true; NaN where either input is NaN
+    values = _masked_signal(
+        (abs_values == 1) & (rel_values == 1),
+        np.isnan(abs_values) | np.isnan(rel_values)
+    )
 
-    return dual_signals
+    return pd.DataFrame(values, index=prices.index, columns=prices.columns)
 
 
 def generate_signals(
@@ -0,0 +1 @@
+# tests/test_backtest/__init__.py
@@ -0,0 +1,253 @@
+# tests/test_backtest/test_engine.py
+"""Tests for the backtest engine."""
+
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add project root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.backtest.engine import (
+    calculate_cvar, calculate_drawdown_series, classify_regimes, calculate_performance_metrics,
+    calculate_rolling_sharpe, calculate_rolling_var_cvar, calculate_strategy_returns,
+    calculate_strategy_returns_batch, calculate_var, extract_trade_log
+)
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+@pytest.fixture
+def daily_returns():
+    """Random daily returns with a few gaps."""
+    np.random.seed(42)
+    dates = pd.date_range('2020-01-01', periods=500, freq='B')
+    returns = pd.Series(np.random.normal(0.0004, 0.012, 500), index=dates, name='strategy')
+    returns.iloc[[0, 120, 121, 300]] = np.nan
+    return returns
+
+
+@pytest.fixture
+def prices_and_signals(sample_prices):
+    """Two signal sets on the shared sample prices: trend and always-long."""
+    trend = (sample_prices > sample_prices.rolling(20).mean()).astype(float)
+    always_long = pd.DataFrame(1.0, index=sample_prices.index, columns=sample_prices.columns)
+    return sample_prices, [trend, always_long]
+
+
+def reference_drawdown(returns: pd.Series) -> pd.Series:
+    """Drawdown via pandas cumprod / expanding max."""
+    cumulative = (1 + returns).cumprod()
+    running_max = cumulative.expanding().max()
+    return (cumulative - running_max) / running_max
+
+
+# ============================================================================
+# calculate_drawdown_series
+# ============================================================================
+
+class TestDrawdownSeries:
+
+    def test_matches_pandas_reference(self, daily_returns):
+        """Kernel reproduces cumprod / expanding-max drawdown exactly."""
+        result = calculate_drawdown_series(daily_returns)
+        pd.testing.assert_series_equal(result, reference_drawdown(daily_returns))
+
+    def test_known_values(self):
+        """+10% then -20% then +5%: drawdown 0, -20%, -16%."""
+        returns = pd.Series([0.10, -0.20, 0.05])
+        result = calculate_drawdown_series(returns)
+        np.testing.assert_array_almost_equal(result.values, [0.0, -0.20, -0.16])
+
+    def test_never_positive(self, daily_returns):
+        result = calculate_drawdown_series(daily_returns)
+        assert (result.dropna() <= 0).all()
+
+    def test_leading_nan_does_not_seed_peak(self):
+        """A leading NaN stays NaN and the first real value sets the peak."""
+        returns = pd.Series([np.nan, -0.10, 0.05])
+        result = calculate_drawdown_series(returns)
+        assert np.isnan(result.iloc[0])
+        assert result.iloc[1] == 0.0
+
+    def test_preserves_index_and_name(self, daily_returns):
+        result = calculate_drawdown_series(daily_returns)
+        assert result.index.equals(daily_returns.index)
+        assert result.name == daily_returns.name
+
+
+# ============================================================================
+# calculate_strategy_returns_batch
+# ============================================================================
+
+class TestStrategyReturnsBatch:
+
+    @pytest.mark.parametrize('frequency', ['M', 'W', 'D'])
+    def test_matches_single_backtests(self, prices_and_signals, frequency):
+        """Each batched result equals the single-strategy backtest."""
+        prices, signals = prices_and_signals
+        costs = [0.0005, 0.0]
+        batch = calculate_strategy_returns_batch(
+            prices, signals, transaction_cost=costs, rebalance_frequency=frequency
+        )
+        assert len(batch) == len(signals)
+        for sig, cost, result in zip(signals, costs, batch):
+            single = calculate_strategy_returns(
+                prices, sig, transaction_cost=cost, rebalance_frequency=frequency
+            )
+            pd.testing.assert_frame_equal(result, single)
+
+    def test_shared_cost_broadcasts(self, prices_and_signals):
+        prices, signals = prices_and_signals
+        shared = calculate_strategy_returns_batch(prices, signals, transaction_cost=0.001)
+        explicit = calculate_strategy_returns_batch(prices, signals, transaction_cost=[0.001, 0.001])
+        for a, b in zip(shared, explicit):
+            pd.testing.assert_frame_equal(a, b)
+
+    def test_signals_aligned_by_label(self, prices_and_signals):
+        """Permuted signal columns and rows trade the same assets."""
+        prices, signals = prices_and_signals
+        trend = signals[0]
+        permuted = trend[trend.columns[::-1]].iloc[::-1]
+        expected = calculate_strategy_returns(prices, trend)
+        pd.testing.assert_frame_equal(calculate_strategy_returns(prices, permuted), expected)
+
+    def test_flat_signals_hold_cash(self, sample_prices):
+        """No active signal: no turnover and the value never moves."""
+        flat = pd.DataFrame(0.0, index=sample_prices.index, columns=sample_prices.columns)
+        result = calculate_strategy_returns_batch(sample_prices, [flat])[0]
+        assert (result['portfolio_value'] == 100.0).all()
+        assert (result['turnover'] == 0.0).all()
+
+    def test_initial_entry_costs(self, sample_prices):
+        """Entering fully invested on day 1 costs one full turnover."""
+        always_long = pd.DataFrame(1.0, index=sample_prices.index, columns=sample_prices.columns)
+        result = calculate_strategy_returns_batch(sample_prices, [always_long],
+                                                  transaction_cost=0.01)[0]
+        assert result['turnover'].iloc[1] == pytest.approx(1.0)
+
+
+# ============================================================================
+# calculate_performance_metrics
+# ============================================================================
+
+class TestPerformanceMetrics:
+
+    def test_matches_pandas_reference(self, daily_returns):
+        """Array implementation agrees with the pandas formulas exactly."""
+        metrics = calculate_performance_metrics(daily_returns)
+
+        total_return = (1 + daily_returns).cumprod().iloc[-1] - 1
+        annualized_return = (1 + total_return) ** (252 / len(daily_returns)) - 1
+        volatility = daily_returns.std() * np.sqrt(252)
+        downside = daily_returns[daily_returns < 0].std() * np.sqrt(252)
+
+        assert metrics['total_return'] == total_return
+        assert metrics['annualized_volatility'] == volatility
+        assert metrics['sortino_ratio'] == pytest.approx(annualized_return / downside, rel=1e-12)
+        assert metrics['max_drawdown'] == reference_drawdown(daily_returns).min()
+        assert metrics['win_rate'] == (daily_returns > 0).sum() / len(daily_returns)
+        assert metrics['avg_win'] == daily_returns[daily_returns > 0].mean()
+        assert metrics['avg_loss'] == daily_returns[daily_returns < 0].mean()
+
+    def test_flat_returns(self):
+        """No volatility and no drawdown: ratios fall back to 0."""
+        metrics = calculate_performance_metrics(pd.Series(0.0, index=range(252)))
+        assert metrics['total_return'] == 0.0
+        assert metrics['sharpe_ratio'] == 0
+        assert metrics['calmar_ratio'] == 0
+        assert metrics['win_rate'] == 0.0
+
+
+# ============================================================================
+# calculate_rolling_var_cvar
+# ============================================================================
+
+class TestRollingVarCvar:
+
+    def test_matches_rolling_apply(self, daily_returns):
+        """Strided windows agree with rolling().apply of the scalar functions."""
+        result = calculate_rolling_var_cvar(daily_returns, window=60)
+        assert list(result.columns) == ['VaR_95%', 'CVaR_95%', 'VaR_99%', 'CVaR_99%']
+
+        for conf in [0.95, 0.99]:
+            pct = int(conf * 100)
+            var = daily_returns.rolling(60).apply(lambda x: calculate_var(x, conf), raw=False)
+            cvar = daily_returns.rolling(60).apply(lambda x: calculate_cvar(x, conf), raw=False)
+            pd.testing.assert_series_equal(result[f'VaR_{pct}%'], var, check_names=False)
+            pd.testing.assert_series_equal(result[f'CVaR_{pct}%'], cvar, check_names=False,
+                                           rtol=1e-12)
+
+    def test_short_series_all_nan(self, daily_returns):
+        result = calculate_rolling_var_cvar(daily_returns.iloc[:30], window=60)
+        assert len(result) == 30
+        assert result.isna().all().all()
+
+
+# ============================================================================
+# calculate_rolling_sharpe
+# ============================================================================
+
+class TestRollingSharpe:
+
+    def test_matches_pandas_with_flat_stretch(self, daily_returns):
+        """Identical to separate rolling mean / std calls, out-of-market days included."""
+        returns = daily_returns.copy()
+        returns.iloc[200:320] = 0.0
+        expected = returns.rolling(60).mean() / returns.rolling(60).std() * np.sqrt(252)
+        pd.testing.assert_series_equal(calculate_rolling_sharpe(returns, 60), expected)
+
+    def test_frame_columns_match_series(self, daily_returns):
+        frame = pd.DataFrame({'a': daily_returns, 'b': daily_returns.shift(5)})
+        result = calculate_rolling_sharpe(frame, 60)
+        for column in frame:
+            pd.testing.assert_series_equal(result[column],
+                                           calculate_rolling_sharpe(frame[column], 60))
+
+
+# ============================================================================
+# extract_trade_log
+# ============================================================================
+
+class TestTradeLog:
+
+    def test_known_trades(self):
+        """Two closed AAA trades; the open BBB position is not logged."""
+        dates = pd.date_range('2024-01-01', periods=6, freq='D')
+        signals = pd.DataFrame({'AAA': [0, 1, 1, 0, 1, 0],
+                                'BBB': [0, 0, 0, 1, 1, 1]}, index=dates, dtype=float)
+        prices = pd.DataFrame({'AAA': [10.0, 10.0, 11.0, 12.0, 12.0, 9.0],
+                               'BBB': 5.0}, index=dates)
+
+        log = extract_trade_log(signals, prices)
+
+        assert list(log['asset']) == ['AAA', 'AAA']
+        assert list(log['entry_date']) == [dates[1], dates[4]]
+        assert list(log['exit_date']) == [dates[3], dates[5]]
+        np.testing.assert_allclose(log['return'], [0.2, -0.25])
+        assert list(log['days_held']) == [2, 1]
+
+    def test_no_trades(self, sample_prices):
+        flat = pd.DataFrame(0.0, index=sample_prices.index, columns=sample_prices.columns)
+        assert extract_trade_log(flat, sample_prices).empty
+
+
+# ============================================================================
+# classify_regimes
+# ============================================================================
+
+class TestClassifyRegimes:
+
+    def test_thresholds_and_warm_up(self):
+        """Sideways during the warm-up window, then bull and bear by threshold."""
+        spy = pd.Series(np.r_[np.full(252, 100.0), 130.0, 120.0, 70.0],
+                        index=pd.date_range('2020-01-01', periods=255, freq='B'))
+        regimes = classify_regimes(spy)
+
+        assert (regimes.iloc[:251] == 'sideways').all()
+        assert list(regimes.iloc[-3:]) == ['bull', 'sideways', 'bear']
+        assert regimes.index.equals(spy.index)
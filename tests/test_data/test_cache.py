@@ -0,0 +1,61 @@
+# tests/test_data/test_cache.py
+"""Tests for the versioned on-disk script cache."""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data import cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the cache at a temporary directory."""
+    monkeypatch.setattr(cache, 'CACHE_DIR', tmp_path)
+    return tmp_path
+
+
+class Counter:
+    """Callable that counts its invocations."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, value):
+        self.calls += 1
+        return {'value': value}
+
+
+class TestCached:
+
+    def test_second_call_reads_pickle(self, cache_dir):
+        fn = Counter()
+        assert cache.cached(('payload', 1), fn, 5) == {'value': 5}
+        assert cache.cached(('payload', 1), fn, 5) == {'value': 5}
+        assert fn.calls == 1
+        assert len(list(cache_dir.glob('*.pkl'))) == 1
+        assert not list(cache_dir.glob('*.tmp'))
+
+    def test_version_bump_invalidates(self, cache_dir, monkeypatch):
+        fn = Counter()
+        cache.cached(('payload', 1), fn, 5)
+        monkeypatch.setattr(cache, 'CACHE_VERSION', cache.CACHE_VERSION + 1)
+        cache.cached(('payload', 1), fn, 5)
+        assert fn.calls == 2
+
+    def test_source_change_invalidates(self, cache_dir, monkeypatch):
+        fn = Counter()
+        cache.cached(('payload', 1), fn, 5)
+        monkeypatch.setattr(cache, 'source_fingerprint', lambda: 'edited engine')
+        cache.cached(('payload', 1), fn, 5)
+        assert fn.calls == 2
+
+    def test_file_key_tracks_content(self, tmp_path):
+        path = tmp_path / 'prices.csv'
+        path.write_text('a\n')
+        before = cache.file_key(path)
+        path.write_text('a,b\n')
+        assert cache.file_key(path) != before
@@ -0,0 +1 @@
+# tests/test_scripts/__init__.py
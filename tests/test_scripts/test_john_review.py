@@ -0,0 +1,87 @@
+# tests/test_scripts/test_john_review.py
+"""Tests for the diff scan behind scripts/john_review.py."""
+
+import sys
+from pathlib import Path
+
+# Add scripts/ (not a package)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'scripts'))
+
+from john_review import scan_diff
+
+
+def diff_lines(text: str) -> list:
+    """Split a diff as git writes it into raw byte lines."""
+    return text.encode().splitlines(keepends=True)
+
+
+# ============================================================================
+# scan_diff
+# ============================================================================
+
+class TestScanDiff:
+
+    def test_plain_paths_and_counts(self):
+        stats = scan_diff(diff_lines(
+            'diff --git a/src/x.py b/src/x.py\n'
+            'index 1111111..2222222 100644\n'
+            '--- a/src/x.py\n'
+            '+++ b/src/x.py\n'
+            '@@ -1,2 +1,2 @@\n'
+            '-old = 1\n'
+            '+new = 1  # TODO\n'
+            ' same = 2\n'
+            'diff --git a/gone.md b/gone.md\n'
+            'deleted file mode 100644\n'
+            'index 3333333..0000000\n'
+            '--- a/gone.md\n'
+            '+++ /dev/null\n'
+            '@@ -1 +0,0 @@\n'
+            '-text\n'
+        ))
+        assert stats['files'] == ['src/x.py', 'gone.md']
+        assert stats['new_files'] == []
+        assert (stats['additions'], stats['deletions']) == (1, 2)
+        assert stats['placeholders'] == ['todo']
+
+    def test_path_with_space(self):
+        # Not quoted, but the ---/+++ lines end with a TAB
+        stats = scan_diff(diff_lines(
+            'diff --git a/my file.py b/my file.py\n'
+            'new file mode 100644\n'
+            'index 0000000..7898192\n'
+            '--- /dev/null\n'
+            '+++ b/my file.py\t\n'
+            '@@ -0,0 +1 @@\n'
+            '+a\n'
+        ))
+        assert stats['files'] == ['my file.py']
+        assert stats['new_files'] == ['my file.py']
+        assert stats['additions'] == 1
+
+    def test_non_ascii_path_is_unquoted(self):
+        stats = scan_diff(diff_lines(
+            'diff --git "a/\\303\\251.py" "b/\\303\\251.py"\n'
+            'new file mode 100644\n'
+            'index 0000000..6178079\n'
+            '--- /dev/null\n'
+            '+++ "b/\\303\\251.py"\n'
+            '@@ -0,0 +1 @@\n'
+            '+b\n'
+            'diff --git "a/\\303\\274.bin" "b/\\303\\274.bin"\n'
+            'new file mode 100644\n'
+            'index 0000000..bdc955b\n'
+            'Binary files /dev/null and "b/\\303\\274.bin" differ\n'
+        ))
+        assert stats['files'] == ['é.py', 'ü.bin']
+        assert stats['new_files'] == ['é.py', 'ü.bin']
+
+    def test_rename_uses_new_name(self):
+        stats = scan_diff(diff_lines(
+            'diff --git "a/\\303\\251.py" "b/\\303\\261 x.py"\n'
+            'similarity index 100%\n'
+            'rename from "\\303\\251.py"\n'
+            'rename to "\\303\\261 x.py"\n'
+        ))
+        assert stats['files'] == ['ñ x.py']
+        assert (stats['additions'], stats['deletions']) == (0, 0)